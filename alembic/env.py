@@ -54,6 +54,7 @@ import app.features.question.models
 import app.features.address.models 
 import app.features.news.models 
 import app.features.school.models 
+import app.features.jobs.models
 from app.infrastructure.base import Base
 
 # add your model's MetaData object here
@@ -0,0 +1,30 @@
+"""unique user answer per attempt
+
+Revision ID: a3c91f0d7e21
+Revises: 7bf4fa2569fa
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91f0d7e21'
+down_revision: Union[str, Sequence[str], None] = '7bf4fa2569fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('user_answers', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_user_answer_attempt_question', ['attempt_id', 'question_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user_answers', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_user_answer_attempt_question', type_='unique')
@@ -0,0 +1,30 @@
+"""attempt question order
+
+Revision ID: c5d2e8b14f60
+Revises: a3c91f0d7e21
+Create Date: 2026-10-18 11:40:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e8b14f60'
+down_revision: Union[str, Sequence[str], None] = 'a3c91f0d7e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('attempt_question', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_attempt_question_order', ['attempt_id', 'order_index'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('attempt_question', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_attempt_question_order', type_='unique')
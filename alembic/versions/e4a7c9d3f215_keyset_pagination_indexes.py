@@ -0,0 +1,42 @@
+"""keyset pagination indexes
+
+Revision ID: e4a7c9d3f215
+Revises: d8e3f1a29b74
+Create Date: 2026-10-18 21:40:12.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c9d3f215'
+down_revision: Union[str, Sequence[str], None] = 'd8e3f1a29b74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.create_index('ix_exam_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('exam_attempt', schema=None) as batch_op:
+        batch_op.create_index('ix_exam_attempt_exam_id_created_at_id', ['exam_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.create_index('ix_addresses_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.drop_index('ix_addresses_created_at_id')
+
+    with op.batch_alter_table('exam_attempt', schema=None) as batch_op:
+        batch_op.drop_index('ix_exam_attempt_exam_id_created_at_id')
+
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.drop_index('ix_exam_created_at_id')
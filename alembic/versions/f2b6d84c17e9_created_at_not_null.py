@@ -0,0 +1,47 @@
+"""created_at not null
+
+Revision ID: f2b6d84c17e9
+Revises: e4a7c9d3f215
+Create Date: 2026-10-18 23:12:05.614027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d84c17e9'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c9d3f215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keyset pagination compares (created_at, id); a NULL key would drop the row from every page
+    op.execute("UPDATE exam SET created_at = COALESCE(updated_at, start_time, end_time, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    op.execute("UPDATE exam_attempt SET created_at = COALESCE(started_at, updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    op.execute("UPDATE addresses SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+    with op.batch_alter_table('exam_attempt', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), existing_server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), existing_server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True)
+
+    with op.batch_alter_table('exam_attempt', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
+
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
@@ -1,13 +1,12 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
-from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from jose import JWTError
 
-from app.infrastructure.database import get_db
-from app.core.config import settings
-from app.core.security import oauth2_scheme
+from app.infrastructure.database import get_async_db, get_db
+from app.core.security import decode_access_token, oauth2_scheme
 
-from app.features.user.models import User
+from app.features.auth.principal import Principal, load_principal, principals
 
 
 credentials_exception = HTTPException(
@@ -16,51 +15,73 @@ credentials_exception = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
-def get_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    # print("Passed token: ", token)
 
-    if token is None:
-        raise HTTPException(status_code=401, detail="Invalid/Missing token")
+def get_token_claims(request: Request, token: str | None = Depends(oauth2_scheme)) -> dict:
+    """The access token claims, decoded once per request.
 
-    try:
-        # token = tokens.get("access_token")
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str | None = payload.get("sub")
-
-        if user_id is None:
-            raise credentials_exception
-        
-        user = db.get(User, str(user_id))
-        # user = db.query(User).filter(User.id == UUID(user_id)).first()
-        if user is None:
-            raise credentials_exception
+    ``auth_middleware`` leaves its decoded claims on ``request.state``;
+    routes it skips decode here.
+    """
+    claims = getattr(request.state, "token_claims", None)
+    if claims is not None:
+        return claims
 
-        return user
+    if not token:
+        raise credentials_exception
 
+    try:
+        claims = decode_access_token(token)
     except JWTError:
         raise credentials_exception
 
-  
-    
-def get_current_user(token: str=Depends(oauth2_scheme), db:Session=Depends(get_db)):
-    # print("TOKEN: ", token)
-    if not token:
+    request.state.token_claims = claims
+    return claims
+
+
+def check_principal(principal: Principal | None) -> Principal:
+    if principal is None:
         raise credentials_exception
-    
-    try:
-        # token = tokens.get("access_token")
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str | None = payload.get("sub")
 
-        if user_id is None:
-            raise credentials_exception
-        
-        user = db.get(User, str(user_id))
-        # user = db.query(User).filter(User.id == UUID(user_id)).first()
-        if user is None:
-            raise credentials_exception
+    if principal.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="User account has been deleted"
+        )
 
-        return user
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
 
-    except JWTError:
-        raise credentials_exception
\ No newline at end of file
+    return principal
+
+
+def get_user(claims: dict = Depends(get_token_claims), db: Session = Depends(get_db)) -> Principal:
+    user_id, jti = str(claims["sub"]), claims.get("jti")
+
+    # the user row is read at most once per cache ttl for each token
+    principal = principals.get(user_id, jti)
+    if principal is None:
+        principal = load_principal(db, user_id)
+        if principal is not None:
+            principals.set(principal, jti)
+
+    return check_principal(principal)
+
+
+def get_current_user(claims: dict = Depends(get_token_claims), db: Session = Depends(get_db)) -> Principal:
+    return get_user(claims, db)
+
+
+async def get_current_user_async(claims: dict = Depends(get_token_claims), db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """``get_current_user`` for routes running on an ``AsyncSession``."""
+    user_id, jti = str(claims["sub"]), claims.get("jti")
+
+    principal = principals.get(user_id, jti)
+    if principal is None:
+        principal = await db.run_sync(load_principal, user_id)
+        if principal is not None:
+            principals.set(principal, jti)
+
+    return check_principal(principal)
@@ -47,7 +47,7 @@ async def login(data: OAuth2PasswordRequestForm=Depends(), db: Session = Depends
 	
 	# verify password
 	# if not verify_password(user.password, db_user.hashed_password):
-	if not hash_password(data.password) == user.hashed_password:
+	if not verify_password(data.password, user.hashed_password):
 		raise HTTPException(
 			status_code=400,
 			detail="Invalid username or password"
@@ -103,7 +103,7 @@ async def access_token(data:OAuth2PasswordRequestForm=Depends(), db:Session=Depe
 			)
 	
 	# if not verify_password(data.password, user.hashed_password):
-	if not hash_password(data.password) == user.hashed_password:
+	if not verify_password(data.password, user.hashed_password):
 		raise HTTPException(
 			status_code=400,
 			detail="Invalid username or password"
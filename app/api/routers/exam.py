@@ -384,15 +384,14 @@ async def import_mcq(file: UploadFile=File(...), db:Session=Depends(get_db)):
         )
     
     text = (await file.read()).decode('utf-8')
-    blocks = text.strip().split('\r\n\r\n')
-    questions =  parse_text_mcq(blocks)
+    questions, errors = parse_text_mcq(text.splitlines())
     
 
-    # return {
-    #     'count': len(questions),
-    #     'questions': questions,
-    # } 
-    return questions
+    return {
+        'count': len(questions),
+        'questions': questions,
+        'errors': errors,
+    }
 
 
 @exam_router.put("/{exam_id}/visibility")
@@ -5,6 +5,7 @@ from app.features.auth.routes import auth_router
 from app.features.question.routes import question_router
 from app.features.school.routes import  school_router
 from app.features.address.routes import  address_router
+from app.features.jobs.routes import router as jobs_router
 
 v1_router = APIRouter(
     prefix="/v1",
@@ -16,4 +17,5 @@ v1_router.include_router(exam_router, )
 v1_router.include_router(user_router, prefix="/users", tags=["Users"])
 v1_router.include_router(question_router,)
 v1_router.include_router(school_router,)
-v1_router.include_router(address_router, prefix="/address", tags=["Address"])
\ No newline at end of file
+v1_router.include_router(address_router, prefix="/address", tags=["Address"])
+v1_router.include_router(jobs_router,)
\ No newline at end of file
@@ -0,0 +1,161 @@
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token, hash_password
+from app.seed.seed_data import load_academic_structure
+from app.features.address.models import Address
+from app.features.school.models import University, Institute, Faculty, School, Program
+from app.features.exam.models import Exam, ExamQuestion, ExamTypeEnum
+from app.features.question.models import Question, Option
+from app.features.user.models import User
+
+
+OPTION_LABELS = "ABCD"
+
+
+@dataclass
+class ExamDayDataset:
+    """Ids and tokens the load test needs; ``students`` maps a student id to its exam id."""
+    exam_ids: list[str] = field(default_factory=list)
+    students: dict[str, str] = field(default_factory=dict)
+    tokens: dict[str, str] = field(default_factory=dict)
+
+
+def _seed_programs(session: Session, structure: dict) -> list[Program]:
+    """Create the university -> institute -> faculty/school -> program tree of ``academic_structure.json``."""
+    uni_data = structure["university"]
+    uni_address = uni_data["address"]
+
+    address = Address(
+        street=uni_address["street"],
+        city=uni_address["city"],
+        state=uni_address["state"],
+        zip_code=uni_address["zipcode"],
+        country=uni_address["country"],
+    )
+    session.add(address)
+    session.flush()
+
+    university = University(name=uni_data["name"], code=uni_data["code"], address_id=address.id)
+    session.add(university)
+    session.flush()
+
+    now = datetime.now(timezone.utc)
+    programs = []
+    for ins_data in uni_data.get("institutes", []):
+        institute = Institute(name=ins_data["name"], university_id=university.id, updated_at=now)
+        session.add(institute)
+        session.flush()
+
+        faculties = [
+            Faculty(name=fa_data["name"], code=fa_data["code"], university_id=university.id, institute_id=institute.id)
+            for fa_data in ins_data.get("faculties", [])
+        ]
+        schools = [
+            School(name=sch_data["name"], university_id=university.id, institute_id=institute.id, updated_at=now)
+            for sch_data in ins_data.get("schools", [])
+        ]
+        session.add_all(faculties + schools)
+        session.flush()
+        if not faculties or not schools:
+            continue
+
+        # a program belongs to both a faculty and a school; borrow the institute's first of the missing side
+        owners = [(faculty, schools[0], fa_data) for faculty, fa_data in zip(faculties, ins_data["faculties"])]
+        owners += [(faculties[0], school, sch_data) for school, sch_data in zip(schools, ins_data["schools"])]
+        for faculty, school, owner_data in owners:
+            for pr_data in owner_data.get("programs", []):
+                programs.append(Program(
+                    name=pr_data["name"],
+                    years_of_study=pr_data["years_of_study"],
+                    level_of_study=pr_data["level_of_study"],
+                    faculty_id=faculty.id,
+                    school_id=school.id,
+                ))
+
+    session.add_all(programs)
+    session.flush()
+    return programs
+
+
+def _seed_exam(session: Session, program: Program, question_count: int) -> Exam:
+    now = datetime.now(timezone.utc)
+    exam = Exam(
+        id=str(uuid.uuid4()),
+        title=f"{program.name} Exit Exam {now:%Y%m%d%H%M%S%f}",
+        program_id=program.id,
+        maximum_marks=question_count,
+        duration=timedelta(minutes=180),
+        duration_minutes=180,
+        exam_type=ExamTypeEnum.MODEL_EXIT_EXAM,
+        is_visible=True,
+        start_time=now - timedelta(minutes=5),
+        end_time=now + timedelta(hours=6),
+    )
+    session.add(exam)
+
+    questions, options, links = [], [], []
+    for index in range(question_count):
+        question_id = str(uuid.uuid4())
+        questions.append({
+            "id": question_id,
+            "exam_id": exam.id,
+            "content": [{"type": "text", "value": f"{program.name} question {index + 1}"}],
+            "marks": 1,
+        })
+        options += [
+            {
+                "id": str(uuid.uuid4()),
+                "question_id": question_id,
+                "label": label,
+                "content": [{"type": "text", "value": f"Option {label}"}],
+                "is_correct": label == "A",
+            }
+            for label in OPTION_LABELS
+        ]
+        links.append({"id": str(uuid.uuid4()), "exam_id": exam.id, "question_id": question_id})
+
+    session.flush()
+    session.execute(insert(Question), questions)
+    session.execute(insert(Option), options)
+    session.execute(insert(ExamQuestion), links)
+    return exam
+
+
+def seed_exam_day(session: Session, students: int = 2000, questions: int = 120, exams: int = 3) -> ExamDayDataset:
+    """Seed an exam day: the academic structure, ``exams`` exams of ``questions`` questions and ``students`` students.
+
+    Bulk rows go in with executemany inserts, so thousands of students seed in seconds.
+    """
+    structure = load_academic_structure(os.path.join(os.path.dirname(__file__), "..", "seed", "academic_structure.json"))
+    programs = _seed_programs(session, structure)
+
+    dataset = ExamDayDataset()
+    for program in programs[:exams]:
+        dataset.exam_ids.append(_seed_exam(session, program, questions).id)
+
+    # every student shares one hash; hashing thousands of passwords is not what is measured
+    hashed_password = hash_password("Benchmark#123")
+    batch = uuid.uuid4().hex[:8]
+    rows = []
+    for index in range(students):
+        student_id = str(uuid.uuid4())
+        rows.append({
+            "id": student_id,
+            "username": f"bench_{batch}_{index}",
+            "email": f"bench_{batch}_{index}@example.com",
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_superuser": False,
+        })
+        dataset.students[student_id] = dataset.exam_ids[index % len(dataset.exam_ids)]
+        dataset.tokens[student_id] = create_access_token(data={"sub": student_id}, expires_delta=timedelta(hours=6))["token"]
+
+    session.execute(insert(User), rows)
+    session.commit()
+    return dataset
@@ -1,7 +1,9 @@
 from typing import Dict, TypeVar, Generic, Type, Optional, List, Any, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete, func
+from app.core.pagination import Page, PageParams, paginate
 from app.infrastructure.base import Base
+from app.infrastructure.cache_manager import repository_cache
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -37,7 +39,12 @@ class BaseRepository(Generic[ModelType]):
     
     def get_multi(self, skip:int=0, limit:int=100) -> List[ModelType]:
         query = select(self.model).offset(skip).limit(limit)
-        return self.db.query(self.model).all()
+        return self.db.scalars(query).all()
+
+    def get_page(self, params: PageParams, *criteria) -> Page:
+        """A keyset page of the rows matching ``criteria``, by ``(created_at, id)``."""
+        query = select(self.model).where(*criteria)
+        return paginate(self.db, query, params, self.model.created_at, self.model.id)
     
     def remove(self, id: Any) -> Optional[ModelType]:
         """Delete a record."""
@@ -45,5 +52,26 @@ class BaseRepository(Generic[ModelType]):
         if obj:
             self.db.delete(obj)
         return obj
-    
-    
+
+
+class CachedRepository:
+    """Mixin for a ``BaseRepository``: ``get_cached`` reads a row by primary key
+    through ``repository_cache`` as ``schema``.
+
+    Entries are tagged ``{tag}:{id}``; watch the model with
+    ``repository_cache.watch`` so writes drop them, and extend ``cache_tags``
+    with the rows the schema embeds.
+    """
+    schema: type
+    tag: str
+
+    def cache_tags(self, id: Any, value) -> List[str]:
+        return [f"{self.tag}:{id}"]
+
+    def get_cached(self, id: Any):
+        return repository_cache.fetch(
+            f"{self.tag}:{id}",
+            self.schema,
+            lambda: self.get(id),
+            lambda value: self.cache_tags(id, value),
+        )
@@ -19,6 +19,23 @@ class Settings(BaseSettings):
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = os.getenv('ACCESS_TOKEN_EXPIRES_MINUTES', 30)
     REFRESH_TOKEN_EXPIRE_DAYS: int = os.getenv('REFRESH_TOKEN_EXPIRE_DAYS', 7)
+    PRINCIPAL_CACHE_BACKEND: str = "memory"  # "memory" or "redis" (shared, with an in-process front)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 300
+    PRINCIPAL_LOCAL_TTL: int = 30  # how stale another worker's copy can get after an invalidation
+    RBAC_CACHE_TTL: int = 60  # role -> permission mapping; bounds staleness across workers
+    REFRESH_TOKEN_STORE: str = "database"  # "database" (row per login) or "redis" (write-behind to the table)
+    REFRESH_TOKEN_FLUSH_INTERVAL: float = 2.0  # seconds between write-behind flushes
+    REFRESH_TOKEN_FLUSH_BATCH: int = 500
+    REFRESH_TOKEN_GC_INTERVAL: int = 3600  # seconds between purges of expired refresh_tokens rows
+    REFRESH_TOKEN_GC_BATCH: int = 1000
+    REVOCATION_BACKEND: str = "memory"  # "memory" (one process) or "redis" (pub/sub to every worker)
+    REVOCATION_BLOOM_CAPACITY: int = 100000  # revocations expected per refresh token lifetime
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    PASSWORD_HASH_WORKERS: int = 4  # argon2 hashes in flight at once; the rest queue
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456  # KiB
+    ARGON2_PARALLELISM: int = 1
 
     # 3. CORS Settings
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -71,6 +88,13 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
     REDIS_CACHE_TTL: int = 3600  # 1 hour
+    REPOSITORY_CACHE_BACKEND: str = "memory"  # "memory" or "redis" (shared, with an in-process front)
+    REPOSITORY_CACHE_SIZE: int = 10000
+    REPOSITORY_CACHE_TTL: int = 300
+    REPOSITORY_NEGATIVE_TTL: int = 30  # how long a missing row is remembered
+    REPOSITORY_LOCAL_TTL: int = 10
+    INVALIDATION_BACKEND: str = "memory"  # "memory" (one process) or "redis" (pub/sub to every worker)
+    INVALIDATION_CHANNEL: str = "cache:invalidate"
     
     @property
     def REDIS_URL(self) -> str:
@@ -104,10 +128,32 @@ class Settings(BaseSettings):
     # 9. Logging Settings
     LOG_LEVEL: str = "INFO"
     LOG_FILE: Optional[str] = "./logs/app.log"
+    SLOW_QUERY_MS: int = 200
+    QUERY_STATS_HEADERS: bool = False  # X-DB-* response headers; development only, they expose query counts and timings
     
     # 10. Testing Settings
     TESTING: bool = False
     TEST_DATABASE_URL: Optional[str] = "sqlite+aiosqlite:///./test.db"
+
+    # 11. Exam Attempt Settings
+    ATTEMPT_SESSION_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared by workers)
+    ATTEMPT_SESSION_CACHE_SIZE: int = 10000
+    EXAM_PAPER_BACKEND: str = "memory"
+    EXAM_PAPER_CACHE_SIZE: int = 200
+    EXAM_CACHE_BACKEND: str = "memory"  # "memory" or "redis" (shared, with an in-process front)
+    EXAM_CACHE_SIZE: int = 1000
+    EXAM_CACHE_TTL: int = 300
+    EXAM_LOCAL_TTL: int = 10  # how stale another worker's copy can get after an invalidation
+    REGRADE_CHUNK_SIZE: int = 500
+
+    # 12. Background Job Settings
+    # "memory" (this process) or "redis" (any worker process); with "redis" UPLOAD_DIR must be
+    # storage every worker host mounts, since import jobs read the upload from there
+    JOB_QUEUE_BACKEND: str = "memory"
+    JOB_WORKERS: int = 2  # jobs run at once per process
+    JOB_QUEUE_KEY: str = "jobs:queue"
+    JOB_HEARTBEAT_INTERVAL: int = 30  # seconds between a running job's heartbeats
+    JOB_STALE_AFTER: int = 300  # a RUNNING job with no heartbeat for this long is requeued on start
     
     # Pydantic V2 Config
     model_config = SettingsConfigDict(
@@ -0,0 +1,86 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Literal, Optional, TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # absent on the last page
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    descending: bool
+    after: tuple[datetime, str] | None  # the key of the last row already sent
+
+
+def encode_cursor(created_at: datetime, id: str, descending: bool) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id), descending])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, bool]:
+    """The key and direction a cursor was issued for; ``ValueError`` if it was not issued here."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id, descending = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(id), bool(descending)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    order: Literal["asc", "desc"] = Query("desc", description="by creation time; a cursor keeps the order it was issued for"),
+) -> PageParams:
+    """Dependency for a keyset-paginated list endpoint."""
+    if cursor is None:
+        return PageParams(limit, order == "desc", None)
+
+    try:
+        created_at, id, descending = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return PageParams(limit, descending, (created_at, id))
+
+
+def paginate(db: Session, stmt: Select, params: PageParams, created_at, id) -> Page[Any]:
+    """One page of ``stmt`` ordered by ``(created_at, id)``, continuing after the cursor.
+
+    Each page is an index range scan on the key however deep the client
+    pages, unlike OFFSET, which reads and discards every earlier row.
+    ``created_at`` is NOT NULL on every paginated table; a NULL key would
+    fall out of the row-value comparison.
+    """
+    key = tuple_(created_at, id)
+    if params.after is not None:
+        stmt = stmt.where(key < tuple_(*params.after) if params.descending else key > tuple_(*params.after))
+
+    order = (created_at.desc(), id.desc()) if params.descending else (created_at.asc(), id.asc())
+    # one extra row tells whether there is a next page
+    rows = db.scalars(stmt.order_by(*order).limit(params.limit + 1)).all()
+    items = rows[:params.limit]
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, created_at.key), getattr(last, id.key), params.descending)
+    return Page[Any](items=items, next_cursor=next_cursor)
@@ -1,4 +1,6 @@
+import asyncio
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 from fastapi import  Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,6 +11,8 @@ from sqlalchemy.orm import Session
 from redis.asyncio import Redis
 from app.infrastructure.database import get_db    
 from app.features.user.models import User
+from app.features.auth.refresh_tokens import IssuedRefreshToken, refresh_tokens
+from app.features.auth.revocation import revocations
 from app.core.config import settings
 
 import uuid 
@@ -20,7 +24,23 @@ ALGORITHM = "HS256"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token", auto_error=False)
 
-pwd_context = CryptContext(schemes=['argon2', "bcrypt", "pbkdf2_sha256"], deprecated='auto')
+# Everything but argon2 is deprecated, so a login with an older hash -- including
+# the unsalted sha256 hex digests stored before -- or with changed argon2
+# parameters returns a replacement hash from verify_and_update.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt", "pbkdf2_sha256", "hex_sha256"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# argon2 releases the GIL, so a small thread pool runs hashes in parallel off
+# the event loop while bounding the CPU and memory a login burst can take.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
 myctx = CryptContext(schemes=["sha256_crypt", "md5_crypt"])
 
 
@@ -52,6 +72,14 @@ def authenticate_user(username: str, password: str, db:Session):
 
     return user
  
+def decode_access_token(token: str) -> dict:
+    """Decode an access token; raises ``JWTError`` when it is invalid, expired or not an access token."""
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    if payload.get("type") != "access" or payload.get("sub") is None:
+        raise JWTError("Not an access token")
+    return payload
+
+
 def verify_token(token: str = Depends(oauth2_scheme)) -> str:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -145,36 +173,16 @@ async def create_refresh_token(user_id: str, db) -> Dict[str, Any]:
         algorithm=settings.ALGORITHM
     )
     
-    # Store refresh token in database (for invalidation)
-    from app.features.auth.models import RefreshToken
-
-    # if refresh token for user already exists, update it
-    existing_token = db.query(RefreshToken).filter_by(user_id=str(user_id)).first()
-    if existing_token:
-        existing_token.token_hash = hash_token(token)
-        existing_token.expires_at = expire
-        existing_token.is_revoked = False
-    else:
-        # add new refresh token if not exists
-        db_refresh_token = RefreshToken(
-        jti=jti,
-        user_id=str(user_id),
-        token_hash=hash_token(token),
-        expires_at=expire,
-        is_revoked=False
-        )
-        db.add(db_refresh_token)
-
-    # Commit to database
-    db.commit()
-    
-    # Also store in Redis for fast validation
-    if redis_client:
-        await redis_client.setex(
-            f"refresh_token:{jti}",
-            settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
-            user_id
-        )
+    # Store the jti for validation and revocation; with the write-behind
+    # store this is a Redis SETEX and the table row follows in a batch.
+    # Both stores block, so they run in the default thread pool.
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        None,
+        _store_refresh_token,
+        IssuedRefreshToken(jti=jti, user_id=str(user_id), token_hash=hash_token(token), expires_at=expire),
+        db,
+    )
     
     return {
         "token": token,
@@ -182,6 +190,11 @@ async def create_refresh_token(user_id: str, db) -> Dict[str, Any]:
         "jti": jti
     }
 
+def _store_refresh_token(token: IssuedRefreshToken, db) -> None:
+    replaced = refresh_tokens.save(token, db)
+    if replaced:
+        revocations.revoke(replaced)
+
 def hash_token(token: str) -> str:
     """Hash token for secure storage"""
     import hashlib
@@ -231,22 +244,11 @@ async def verify_token(token: str, expected_type: str = "access") -> dict:
             if not jti:
                 raise credentials_exception
             
-            # Check if refresh token is revoked
-            if redis_client:
-                # Check in Redis first
-                stored_user = await redis_client.get(f"refresh_token:{jti}")
-                if not stored_user:
-                    raise credentials_exception
-            else:
-                # Fallback to database check
-                from app.infrastructure.database import get_db
-                from app.features.auth.models import RefreshToken
-                db = next(get_db())
-                db_token = db.query(RefreshToken).filter(
-                    RefreshToken.jti == jti,
-                    RefreshToken.is_revoked == False
-                ).first()
-                if not db_token:
+            # A jti the filter has not seen was never revoked, superseded or
+            # deleted, so only a hit, possibly a false positive, asks the store
+            if revocations.might_be_revoked(jti):
+                loop = asyncio.get_running_loop()
+                if not await loop.run_in_executor(None, refresh_tokens.is_active, jti):
                     raise credentials_exception
         
         return payload
@@ -257,15 +259,8 @@ async def verify_token(token: str, expected_type: str = "access") -> dict:
 
 async def revoke_refresh_token(jti: str, db):
     """Revoke a refresh token (logout or security measure)"""
-    if redis_client:
-        await redis_client.delete(f"refresh_token:{jti}")
-    
-    # Mark as revoked in database
-    from app.features.auth.models import RefreshToken
-    db_token = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
-    if db_token:
-        db_token.is_revoked = True
-        await db.commit()
+    refresh_tokens.revoke(jti, db)
+    revocations.revoke(jti)
 
 def is_password_strong(password:str):
     SYMBOLS = ["!", "@", "#", "$", "%", "&", "*", "(", ")", "-", "_", "+", "=", "[", "]", "{", "}", "|", "\\", ";", ":", "'", '"', ",", "<", ".", ">", "/", "?"]
@@ -307,15 +302,25 @@ def validate_password(password: str) -> bool:
 
     
 def hash_password(password: str) -> str:
-    # Implement a proper password hashing mechanism here
-    import hashlib
+    """Hash on the password pool; the calling thread waits, so registration
+    and password changes in sync routes share the pool's bound with logins."""
+    return password_executor.submit(pwd_context.hash, password).result()
 
-    return hashlib.sha256(password.encode()).hexdigest()
-    # return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return hash_password(plain_password) == hashed_password
-    # return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify on the password pool.
+
+    Returns ``(verified, new_hash)``; ``new_hash`` is set when the stored hash
+    uses a deprecated scheme or outdated argon2 parameters and should replace it.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
 def get_current_user(user_id: str = Depends(verify_token), db: Session = Depends(get_db)):
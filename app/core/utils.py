@@ -1,49 +1,102 @@
 """Utility functions"""
 import re 
+from dataclasses import dataclass
+from typing import Iterable, Iterator
 
-def clean_question(line:str) -> str:
-    line = line.strip()  # removes \r, \n spaces
-    return re.sub(r"^\d+\s*[\.\)-\:]\s*", "", line)
-
-
-def parse_text_mcq(blocks:list[str]) -> str:
-    questions = []
-
-    for block in blocks:
-
-        lines = block.splitlines()
+# "12." / "12)" / "12-" / "12:" before the question text
+_QUESTION_NUMBER = re.compile(r"^\d+\s*[.):-]\s*")
+_QUESTION_LINE = re.compile(r"^\d+\s*[.):-]")
+# "A)" / "b." -- any letter, so more than four options work
+_OPTION_LINE = re.compile(r"^([A-Za-z])\s*[.)]\s*(.*)$")
+_ANSWER_LINE = re.compile(r"^ANSWER\s*[:-]?\s*(.*)$", re.IGNORECASE)
 
-        options = {}
-        correct_answer = None
-        question_text = None
 
-        for line in lines:
-            line = line.strip()
-
-            if re.match(r'^\d+', line):
-                line = clean_question(line)
-                question_text = line
-            elif re.match(r"^[A-D]\)", line):
-                key = line[0]
-                value = line[2:].strip()
-                options[key] = value
-
-            elif line.startswith('ANSWER'):
-                correct_answer = line.replace('ANSWER:', "").strip()
-
-        if not question_text or not options or not correct_answer:
-            raise ValueError(
-                f"Invalid MCQ format in block:\n {block}"
-            )
-            
-        questions.append({
-            "question": question_text,
-            "options": options, 
-            "answer": correct_answer,
-        })
-        
-
-    return questions 
+def clean_question(line:str) -> str:
+    line = line.strip()  # removes \r, \n spaces
+    return _QUESTION_NUMBER.sub("", line, count=1)
+
+
+@dataclass(frozen=True)
+class MCQBlockError:
+    block: int  # 1-based block number
+    line: int  # line the block starts on
+    message: str
+
+
+def _parse_block(lines: list[str]) -> dict | str:
+    """One block as a ``QuestionUploadSchema``-shaped dict, or the reason it is invalid."""
+    question, options, answer = [], {}, None
+    current = None  # list the next continuation line belongs to
+
+    for line in lines:
+        if _QUESTION_LINE.match(line) and not question:
+            question.append(clean_question(line))
+            current = question
+        elif (match := _ANSWER_LINE.match(line)):
+            answer = match.group(1).strip().upper()
+            current = None
+        elif question and (match := _OPTION_LINE.match(line)):
+            key = match.group(1).upper()
+            if key in options:
+                return f"Option {key} appears twice"
+            options[key] = [match.group(2).strip()]
+            current = options[key]
+        elif current is not None:
+            current.append(line)
+        else:
+            return f"Unexpected line {line!r}"
+
+    if not question:
+        return "Missing numbered question line"
+    if len(options) < 2:
+        return "At least two options required"
+    if not answer:
+        return "Missing ANSWER line"
+    if answer not in options:
+        return f"Answer {answer!r} is not one of the options {', '.join(options)}"
+
+    return {
+        "content": " ".join(question),
+        "question_type": "mcq",
+        "marks": 1,
+        "options": [{"key": key, "text": " ".join(text)} for key, text in options.items()],
+        "correct_option": answer,
+    }
+
+
+def iter_text_mcq(lines: Iterable[str]) -> Iterator[dict | MCQBlockError]:
+    """Parse blank-line separated MCQ blocks as lines arrive.
+
+    Yields a question dict per valid block and an ``MCQBlockError`` per
+    invalid one, so one bad block does not stop the rest. Any newline
+    style works: lines are stripped before parsing.
+    """
+    block, block_number, start = [], 0, 0
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line:
+            if not block:
+                start = number
+            block.append(line)
+            continue
+        if block:
+            block_number += 1
+            parsed = _parse_block(block)
+            yield parsed if isinstance(parsed, dict) else MCQBlockError(block_number, start, parsed)
+            block = []
+
+    if block:
+        block_number += 1
+        parsed = _parse_block(block)
+        yield parsed if isinstance(parsed, dict) else MCQBlockError(block_number, start, parsed)
+
+
+def parse_text_mcq(lines: Iterable[str]) -> tuple[list[dict], list[MCQBlockError]]:
+    questions, errors = [], []
+    for result in iter_text_mcq(lines):
+        (errors if isinstance(result, MCQBlockError) else questions).append(result)
+    return questions, errors
 
 
 # def calculate_score(db: Session, attempt_id: str):
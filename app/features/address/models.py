@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -8,6 +8,7 @@ from app.infrastructure.base import Base
 
 class Address(Base):
     __tablename__ = "addresses"
+    __table_args__ = (Index("ix_addresses_created_at_id", "created_at", "id"),)
     id:Mapped[str] = mapped_column(
         String(36), 
         primary_key=True, 
@@ -18,7 +19,7 @@ class Address(Base):
     state = Column(String(255), nullable=False)
     zip_code = Column(String(255), nullable=False)
     country = Column(String(255), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship with University
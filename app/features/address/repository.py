@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
+from app.core.pagination import Page, PageParams, paginate
 from .models import Address
 
 
@@ -12,6 +13,10 @@ class AddressRepository:
     
     def get_all(self):
         return self.db.query(Address).all()
+
+    def get_page(self, params: PageParams, *criteria) -> Page:
+        stmt = select(Address).where(*criteria)
+        return paginate(self.db, stmt, params, Address.created_at, Address.id)
     
     def find_address(self, address_data):
         """Finds and Queries address"""
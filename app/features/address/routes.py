@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.orm import Session  
+from app.core.pagination import Page, PageParams, page_params
 from app.infrastructure.database import get_db
 from .services import AddressService
 from .schemas import AddressResponse, AddressUpdateRequest, AddressCreateRequest
 from .exceptions import AddressAlreadyExistsError, AddressNotFoundError
-from typing import List
+from typing import List, Optional
 
 address_router = APIRouter()
 
@@ -39,11 +40,16 @@ async def create_address(address: AddressCreateRequest=None, db:Session=Depends(
         )
 
 
-@address_router.get("/all", response_model=List[AddressResponse])
-async def get_addresses(db:Session = Depends(get_db)):
+@address_router.get("/all", response_model=Page[AddressResponse])
+async def get_addresses(
+    params: PageParams = Depends(page_params),
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     try:
         service = AddressService(db)
-        return  service.get_addresses()
+        return  service.get_addresses(params, city=city, country=country)
     except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,7 +1,10 @@
 from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, PageParams
+
 from .exceptions import AddressNotFoundError 
 from .models import Address
 from .repository import AddressRepository
@@ -60,8 +63,13 @@ class AddressService:
             )
     
 
-    def get_addresses(self):
-        return self.repo.get_all()
+    def get_addresses(self, params: PageParams, city: str | None = None, country: str | None = None) -> Page:
+        criteria = []
+        if city is not None:
+            criteria.append(func.lower(Address.city) == city.lower())
+        if country is not None:
+            criteria.append(func.lower(Address.country) == country.lower())
+        return self.repo.get_page(params, *criteria)
     
 
     def update(self, id, address_data: AddressCreateRequest):
@@ -0,0 +1,99 @@
+import json
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.invalidation import invalidations
+from app.infrastructure.store import StoreCache, build_store
+from ..user.models import User
+from .models import Role, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as the request needs it, without a database row."""
+    id: str
+    username: str
+    email: str
+    is_active: bool
+    is_superuser: bool
+    is_deleted: bool
+    roles: frozenset[str]
+
+    def has_role(self, *roles: str) -> bool:
+        return not self.roles.isdisjoint(roles)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "id": self.id,
+            "username": self.username,
+            "email": self.email,
+            "is_active": self.is_active,
+            "is_superuser": self.is_superuser,
+            "is_deleted": self.is_deleted,
+            "roles": sorted(self.roles),
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "Principal":
+        raw = json.loads(data)
+        return cls(**{**raw, "roles": frozenset(raw["roles"])})
+
+
+def load_principal(db: Session, user_id: str) -> Principal | None:
+    """Read the user and its role names in one query."""
+    stmt = (
+        select(User, Role.name)
+        .outerjoin(UserRole, UserRole.user_id == User.id)
+        .outerjoin(Role, Role.id == UserRole.role_id)
+        .where(User.id == user_id)
+    )
+    rows = db.execute(stmt).all()
+    if not rows:
+        return None
+
+    user = rows[0][0]
+    return Principal(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+        is_deleted=getattr(user, "is_deleted", False),
+        roles=frozenset(getattr(name, "value", name) for _, name in rows if name is not None),
+    )
+
+
+class PrincipalCache(StoreCache):
+    """Principals keyed by ``user_id:jti`` and tagged ``user:{user_id}``, so every token of a user can be dropped at once."""
+
+    def get(self, user_id: str, jti: str | None) -> Principal | None:
+        return super().get(f"{user_id}:{jti}")
+
+    def set(self, principal: Principal, jti: str | None) -> None:
+        super().set(f"{principal.id}:{jti}", principal, settings.PRINCIPAL_CACHE_TTL, tags=(f"user:{principal.id}",))
+
+    def invalidate_user(self, user_id: str) -> None:
+        self.invalidate_tag(f"user:{user_id}")
+
+
+principals = PrincipalCache(
+    build_store(
+        settings.PRINCIPAL_CACHE_BACKEND,
+        "principal:",
+        settings.PRINCIPAL_CACHE_SIZE,
+        dumps=Principal.to_json,
+        loads=Principal.from_json,
+        local_ttl=settings.PRINCIPAL_LOCAL_TTL,
+    ),
+    name="Principal",
+)
+
+
+# A committed change to a user or its role links drops its cached principals
+# in every worker.
+invalidations.watch(User, "principal", lambda user: [user.id])
+invalidations.watch(UserRole, "principal", lambda link: [link.user_id])
+invalidations.subscribe("principal", principals.invalidate_user)
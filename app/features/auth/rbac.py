@@ -0,0 +1,77 @@
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.infrastructure.invalidation import invalidations
+from .models import Permission, Role, RolePermission
+
+
+def _name(value) -> str:
+    return getattr(value, "value", value)
+
+
+class RolePermissions:
+    """Role name -> permission names, flattened once per version.
+
+    A user's roles come with the cached ``Principal``; this adds the
+    permissions those roles grant. ``invalidate`` bumps the version and the
+    next lookup reloads the mapping. Without the Redis invalidation bus,
+    changes committed by another worker are picked up within ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.version = 0
+        self._loaded: tuple[int, float] | None = None  # (version, monotonic load time)
+        self._by_role: dict[str, frozenset[str]] = {}
+        self._by_roles: dict[frozenset[str], frozenset[str]] = {}
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        if self._loaded is None:
+            return True
+        version, loaded_at = self._loaded
+        return version != self.version or time.monotonic() - loaded_at >= self.ttl
+
+    def _load(self, db: Session) -> None:
+        version = self.version
+        rows = db.execute(
+            select(Role.name, Permission.name)
+            .join(RolePermission, RolePermission.role_id == Role.id)
+            .join(Permission, Permission.id == RolePermission.permission_id)
+        ).all()
+
+        by_role: dict[str, set[str]] = {}
+        for role, permission in rows:
+            by_role.setdefault(_name(role), set()).add(_name(permission))
+
+        self._by_role = {role: frozenset(permissions) for role, permissions in by_role.items()}
+        self._by_roles = {}
+        self._loaded = (version, time.monotonic())
+
+    def resolve(self, db: Session, roles: frozenset[str]) -> frozenset[str]:
+        """Every permission granted by ``roles``."""
+        with self._lock:
+            if self._stale():
+                self._load(db)
+
+            permissions = self._by_roles.get(roles)
+            if permissions is None:
+                permissions = frozenset().union(*(self._by_role.get(role, ()) for role in roles))
+                self._by_roles[roles] = permissions
+            return permissions
+
+    def invalidate(self) -> None:
+        self.version += 1
+
+
+role_permissions = RolePermissions(settings.RBAC_CACHE_TTL)
+
+
+# Role assignments are part of the Principal and invalidated with it; a
+# committed change to roles, permissions or their links drops the mapping.
+invalidations.watch((Role, Permission, RolePermission), "rbac", lambda row: ["*"])
+invalidations.subscribe("rbac", lambda key: role_permissions.invalidate())
@@ -0,0 +1,275 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.infrastructure.database import SessionLocal
+from .models import RefreshToken
+
+
+@dataclass(frozen=True)
+class IssuedRefreshToken:
+    jti: str
+    user_id: str
+    token_hash: str
+    expires_at: datetime
+
+    @property
+    def ttl(self) -> int:
+        return max(int((self.expires_at - datetime.now(timezone.utc)).total_seconds()), 1)
+
+
+def _revoke_row(db: Session, jti: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == jti)
+        .values(is_revoked=True, revoked_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+
+
+class DatabaseRefreshTokenStore:
+    """A ``refresh_tokens`` row per issued token, written and committed in the login request.
+
+    A login marks the user's previous row revoked rather than overwriting it,
+    so the revocation list can be rebuilt from the table after a restart.
+    """
+    backend = "database"
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def save(self, token: IssuedRefreshToken, db: Session) -> str | None:
+        """Returns the jti this token replaces, which is no longer valid."""
+        replaced = None
+        for existing in db.query(RefreshToken).filter_by(user_id=token.user_id, is_revoked=False):
+            replaced = existing.jti
+            existing.is_revoked = True
+            existing.revoked_at = datetime.now(timezone.utc)
+        db.add(RefreshToken(
+            jti=token.jti,
+            user_id=token.user_id,
+            token_hash=token.token_hash,
+            expires_at=token.expires_at,
+            is_revoked=False,
+        ))
+        db.commit()
+        return replaced
+
+    def is_active(self, jti: str) -> bool:
+        with self.session_factory() as db:
+            return db.query(RefreshToken.id).filter(
+                RefreshToken.jti == jti,
+                RefreshToken.is_revoked == False,
+            ).first() is not None
+
+    def revoke(self, jti: str, db: Session) -> None:
+        _revoke_row(db, jti)
+
+    def close(self) -> None:
+        pass
+
+
+class WriteBehindRefreshTokenStore:
+    """Redis holds the active jtis; ``refresh_tokens`` rows follow in batches.
+
+    A login costs one ``SETEX`` and swaps the user's current jti under
+    ``{prefix}user:{user_id}``, deleting the one it replaces, so a user has
+    one valid refresh token as with the database store. Issued tokens queue
+    in memory and a daemon thread inserts them every ``interval`` seconds, at
+    most ``batch_size`` rows per statement, so the table stays an audit trail
+    and a way to rebuild revocations without taking row locks on the login
+    path. Tokens still queued when the process dies are missing from the
+    table but stay valid in Redis until they expire.
+    """
+    backend = "redis"
+
+    def __init__(self, client, session_factory: Callable[[], Session], batch_size: int, interval: float, prefix: str = "refresh_token:"):
+        self.client = client
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.prefix = prefix
+        self._pending: deque[IssuedRefreshToken] = deque()
+        self._revoked: set[str] = set()  # jtis revoked while still queued
+        self._superseded: set[str] = set()  # written jtis to mark revoked on the next flush
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _key(self, jti: str) -> str:
+        return f"{self.prefix}{jti}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    def save(self, token: IssuedRefreshToken, db: Session | None = None) -> str | None:
+        """Returns the jti this token replaces, which is no longer valid."""
+        self.client.setex(self._key(token.jti), token.ttl, token.user_id)
+        replaced = self.client.set(self._user_key(token.user_id), token.jti, ex=token.ttl, get=True)
+        if replaced:
+            self.client.delete(self._key(replaced))
+        with self._lock:
+            if replaced:
+                self._retire(replaced)
+            self._pending.append(token)
+            pending = len(self._pending)
+        self._ensure_flusher()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return replaced
+
+    def _retire(self, jti: str) -> None:
+        """Record ``jti`` as revoked when its row is written, or on the next flush if it is; holds ``_lock``."""
+        if any(token.jti == jti for token in self._pending):
+            self._revoked.add(jti)
+        else:
+            self._superseded.add(jti)
+
+    def is_active(self, jti: str) -> bool:
+        return bool(self.client.exists(self._key(jti)))
+
+    def revoke(self, jti: str, db: Session) -> None:
+        self.client.delete(self._key(jti))
+        # a running flush may have popped the jti and not committed its row
+        # yet, so the flusher marks the row on its next pass instead
+        with self._lock:
+            self._retire(jti)
+        self._ensure_flusher()
+
+    def flush(self) -> int:
+        """Insert every queued token; returns the number of rows written.
+
+        A row the database rejects, such as one for a user deleted since the
+        login, is logged and dropped so it does not hold back the rest.
+        """
+        written = 0
+        while True:
+            with self._lock:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                revoked = self._revoked & {token.jti for token in batch}
+                self._revoked -= revoked
+                if not batch:
+                    superseded, self._superseded = self._superseded, set()
+            if not batch:
+                if superseded:
+                    with self.session_factory() as db:
+                        db.execute(
+                            update(RefreshToken)
+                            .where(RefreshToken.jti.in_(superseded))
+                            .values(is_revoked=True, revoked_at=datetime.now(timezone.utc))
+                        )
+                        db.commit()
+                return written
+
+            try:
+                self._insert(batch, revoked)
+                written += len(batch)
+            except IntegrityError:
+                # one bad row fails the statement; write the rest one by one
+                for i, token in enumerate(batch):
+                    try:
+                        self._insert([token], revoked)
+                        written += 1
+                    except IntegrityError as e:
+                        logger.error(f"Dropping refresh token row {token.jti} for user {token.user_id}: {e.orig}")
+                    except Exception:
+                        self._requeue(batch[i:], revoked)
+                        raise
+            except Exception:
+                # put the batch back in front; the next tick retries it
+                self._requeue(batch, revoked)
+                raise
+
+    def _insert(self, tokens: list[IssuedRefreshToken], revoked: set[str]) -> None:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "jti": token.jti,
+                "user_id": token.user_id,
+                "token_hash": token.token_hash,
+                "expires_at": token.expires_at,
+                "is_revoked": token.jti in revoked,
+                "revoked_at": now if token.jti in revoked else None,
+            }
+            for token in tokens
+        ]
+        with self.session_factory() as db:
+            db.execute(insert(RefreshToken), rows)
+            db.commit()
+
+    def _requeue(self, tokens: list[IssuedRefreshToken], revoked: set[str]) -> None:
+        with self._lock:
+            self._pending.extendleft(reversed(tokens))
+            self._revoked |= revoked
+
+    def _ensure_flusher(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="refresh-token-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                written = self.flush()
+                if written:
+                    logger.info(f"Flushed {written} refresh tokens")
+            except Exception:
+                logger.exception("Refresh token flush failed")
+
+    def close(self) -> None:
+        """Stop the flusher and write what is still queued; ``save`` starts it again."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+def purge_expired_refresh_tokens(session_factory: Callable[[], Session], batch_size: int) -> int:
+    """Delete expired rows ``batch_size`` at a time, committing each batch; returns the count."""
+    deleted = 0
+    with session_factory() as db:
+        while True:
+            ids = db.scalars(
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at <= datetime.now(timezone.utc))
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                return deleted
+            db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+            db.commit()
+            deleted += len(ids)
+
+
+def build_refresh_token_store(backend: str, session_factory: Callable[[], Session]):
+    """``"database"`` writes the row in the request; ``"redis"`` is write-behind."""
+    if backend == "redis":
+        from app.infrastructure.redis import sync_redis_client
+        return WriteBehindRefreshTokenStore(
+            sync_redis_client,
+            session_factory,
+            batch_size=settings.REFRESH_TOKEN_FLUSH_BATCH,
+            interval=settings.REFRESH_TOKEN_FLUSH_INTERVAL,
+        )
+    return DatabaseRefreshTokenStore(session_factory)
+
+
+refresh_tokens = build_refresh_token_store(settings.REFRESH_TOKEN_STORE, SessionLocal)
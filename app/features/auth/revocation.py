@@ -0,0 +1,149 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from .models import RefreshToken
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings; false positives at ``error_rate`` once ``capacity`` items are in."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        positions = self._positions(item)
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+    """Revoked refresh-token jtis, answered in process.
+
+    A jti the filter has never seen is not revoked, so the common case costs
+    no round trip; a hit may be a false positive and is confirmed against the
+    token store. The filter is loaded from the revoked rows of
+    ``refresh_tokens`` at start, and with the ``"redis"`` backend revocations
+    are published on ``channel`` and every worker adds them to its own filter.
+
+    Bits are never cleared, so revocations go into one of two generations of
+    ``generation_ttl`` seconds, the refresh token lifetime: a jti is kept for
+    at least that long, by when its token has expired, and the filter holds
+    at most two generations' worth of revocations however long the process runs.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, generation_ttl: float, client=None, channel: str = "refresh_token:revoked"):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.generation_ttl = generation_ttl
+        self.client = client
+        self.channel = channel
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._previous: BloomFilter | None = None
+        self._rotated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def _rotate(self) -> None:
+        if time.monotonic() - self._rotated_at < self.generation_ttl:
+            return
+        with self._lock:
+            if time.monotonic() - self._rotated_at >= self.generation_ttl:
+                self._previous, self.bloom = self.bloom, BloomFilter(self.capacity, self.error_rate)
+                self._rotated_at = time.monotonic()
+
+    def _add(self, jti: str) -> None:
+        self._rotate()
+        self.bloom.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        self._rotate()
+        previous = self._previous
+        return jti in self.bloom or (previous is not None and jti in previous)
+
+    def revoke(self, jti: str) -> None:
+        self._add(jti)
+        if self.client is not None:
+            try:
+                self.client.publish(self.channel, jti)
+            except Exception as e:
+                logger.warning(f"Publishing revocation of {jti} failed: {e}")
+
+    def load(self, db: Session) -> int:
+        """Add the revoked, unexpired jtis recorded in ``refresh_tokens``."""
+        jtis = db.scalars(
+            select(RefreshToken.jti).where(
+                RefreshToken.is_revoked == True,
+                RefreshToken.expires_at > datetime.now(timezone.utc),
+            )
+        ).all()
+        for jti in jtis:
+            self._add(jti)
+        return len(jtis)
+
+    def start(self, session_factory) -> None:
+        """Load the table and, with a Redis client, follow the revocation channel."""
+        try:
+            with session_factory() as db:
+                self.load(db)
+        except Exception as e:
+            logger.warning(f"Loading revoked refresh tokens failed: {e}")
+
+        if self.client is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._listen, args=(session_factory,), name="revocation-listener", daemon=True)
+        self._thread.start()
+
+    def _listen(self, session_factory) -> None:
+        resubscribed = False
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if resubscribed:
+                    # revocations published while disconnected are in the table
+                    with session_factory() as db:
+                        self.load(db)
+                for message in pubsub.listen():
+                    self._add(message["data"])
+            except Exception as e:
+                logger.warning(f"Revocation channel lost, resubscribing: {e}")
+                resubscribed = True
+                time.sleep(1)
+
+
+def build_revocation_list(backend: str) -> RevocationList:
+    """``"memory"`` for a single process; ``"redis"`` syncs every worker over pub/sub."""
+    client = None
+    if backend == "redis":
+        from app.infrastructure.redis import sync_redis_client
+        client = sync_redis_client
+    return RevocationList(
+        settings.REVOCATION_BLOOM_CAPACITY,
+        settings.REVOCATION_BLOOM_ERROR_RATE,
+        generation_ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
+        client=client,
+    )
+
+
+revocations = build_revocation_list(settings.REVOCATION_BACKEND)
@@ -1,25 +1,43 @@
 from fastapi import HTTPException, Depends, status
-from typing import List, Optional
-from app.core.security import get_user 
-from ..user.models import User
+from typing import List
+from sqlalchemy.orm import Session
+
+from app.api.deps.user import get_user
+from app.infrastructure.database import get_db
+from .models import RoleName
+from .principal import Principal
+from .rbac import role_permissions
+
+
+# every role but student
+STAFF_ROLES = frozenset(role.value for role in RoleName if role is not RoleName.STUDENT)
+
+
+forbidden_exception = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="You do not have the required permission",
+)
+
 
 class RoleChecker:
     def __init__(self, allowed_roles: List[str]):
-        self.allowed_roles = allowed_roles
+        self.allowed_roles = frozenset(getattr(role, "value", role) for role in allowed_roles)
+
 
+    def __call__(self, user: Principal = Depends(get_user)):
+        # role names come with the cached principal, no query per call
+        if user.roles.isdisjoint(self.allowed_roles):
+            raise forbidden_exception
+        return True
 
-    def __call__(self, user: User = Depends(get_user)):
-        # Extract role names from the user object
-        user_role_names = [role.name for role in user.roles]
 
-        # check if any of hte user's roles match tht allowed roles
-        for role in self.allowed_roles:
-            if role in user_role_names:
-                return True
-        
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have the required permission",
-        )
+class PermissionChecker:
+    def __init__(self, *permissions: str):
+        self.permissions = frozenset(getattr(permission, "value", permission) for permission in permissions)
 
 
+    def __call__(self, user: Principal = Depends(get_user), db: Session = Depends(get_db)):
+        # every listed permission is required
+        if not self.permissions <= role_permissions.resolve(db, user.roles):
+            raise forbidden_exception
+        return True
@@ -18,11 +18,12 @@ from app.core.security import (
 	create_refresh_token,
     is_password_strong,
 	verify_token,
-	hash_password,
-	verify_password,
+	verify_and_update_password,
+	revoke_refresh_token,
 )
 
 from app.api.deps.user import get_user, get_current_user
+from app.middleware.auth_middleware import public
 
 
 auth_router = APIRouter(
@@ -32,6 +33,7 @@ auth_router = APIRouter(
 
 
 @auth_router.post("/login")
+@public
 async def login(data: OAuth2PasswordRequestForm=Depends(), db: Session = Depends(get_db)):
 	"""
     Authenticate user and return access & refresh tokens
@@ -47,12 +49,15 @@ async def login(data: OAuth2PasswordRequestForm=Depends(), db: Session = Depends
 			)
 	
 	# verify password
-	# if not verify_password(user.password, db_user.hashed_password):
-	if not hash_password(data.password) == user.hashed_password:
+	verified, new_hash = await verify_and_update_password(data.password, user.hashed_password)
+	if not verified:
 		raise HTTPException(
 			status_code=400,
 			detail="Invalid username or password"
 			)
+	if new_hash:
+		# rehash with the current scheme and argon2 parameters
+		user.hashed_password = new_hash
 	
 	# check if user if active
 	if not user.is_active:
@@ -95,6 +100,7 @@ async def login(data: OAuth2PasswordRequestForm=Depends(), db: Session = Depends
 
 
 @auth_router.post("/token", response_model=UserTokenResponse)
+@public
 async def access_token(data:OAuth2PasswordRequestForm=Depends(), db:Session=Depends(get_db)):
 	user = db.query(User).filter(User.username==data.username).first()
 	if not user:
@@ -103,12 +109,14 @@ async def access_token(data:OAuth2PasswordRequestForm=Depends(), db:Session=Depe
 			detail="Invalid username or password"
 			)
 	
-	# if not verify_password(data.password, user.hashed_password):
-	if not hash_password(data.password) == user.hashed_password:
+	verified, new_hash = await verify_and_update_password(data.password, user.hashed_password)
+	if not verified:
 		raise HTTPException(
 			status_code=400,
 			detail="Invalid username or password"
 		)
+	if new_hash:
+		user.hashed_password = new_hash
 
 	# check if user if active
 	if not user.is_active:
@@ -151,6 +159,7 @@ async def access_token(data:OAuth2PasswordRequestForm=Depends(), db:Session=Depe
 
 
 @auth_router.post("/activate")
+@public
 async def activate_user_account(username:str, db:Session = Depends(get_db)):
 	user = db.query(User).filter(User.username==username).first()
 	
@@ -172,11 +181,12 @@ async def activate_user_account(username:str, db:Session = Depends(get_db)):
 
 @auth_router.delete("/{user_id}/refresh-tokens/delete")
 async def delete_refresh_tokens(user_id: UUID, db:Session=Depends(get_db)):
-	tokens = db.query(RefreshToken).filter_by(user_id=user_id).all()
+	# the rows stay, marked revoked, so the revocation list can be rebuilt
+	# from them; the purge task deletes them once they expire
+	tokens = db.query(RefreshToken).filter_by(user_id=str(user_id), is_revoked=False).all()
 	for token in tokens:
-		db.delete(token)
-	db.flush()
-	return {"message": f"Deleted {len(tokens)} refresh tokens for user {user_id}"}
+		await revoke_refresh_token(token.jti, db)
+	return {"message": f"Revoked {len(tokens)} refresh tokens for user {user_id}"}
 
 @auth_router.delete("/refresh-tokens")
 async def delete_refresh_tokens(db:Session=Depends(get_db)):
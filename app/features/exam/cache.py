@@ -0,0 +1,201 @@
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import object_session
+
+from app.core.config import settings
+from app.infrastructure.invalidation import invalidations
+from app.infrastructure.store import StoreCache, build_store
+from ..question.models import Question, Option
+from .models import Exam, ExamAttempt, ExamQuestion
+from .schemas import ExamResponse
+
+
+@dataclass(frozen=True)
+class AttemptSession:
+    """Everything the answer endpoints need to authorize a write without touching the database."""
+    attempt_id: str
+    exam_id: str
+    user_id: str
+    expires_at: datetime
+    options: dict[str, frozenset[str]]  # question_id -> option ids of that question
+
+    def is_expired(self, now: datetime) -> bool:
+        return now > self.expires_at
+
+    def has_question(self, question_id: str) -> bool:
+        return question_id in self.options
+
+    def has_option(self, question_id: str, option_id: str) -> bool:
+        return option_id in self.options.get(question_id, ())
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "attempt_id": self.attempt_id,
+            "exam_id": self.exam_id,
+            "user_id": self.user_id,
+            "expires_at": self.expires_at.isoformat(),
+            "options": {qid: sorted(opts) for qid, opts in self.options.items()},
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "AttemptSession":
+        raw = json.loads(data)
+        return cls(
+            attempt_id=raw["attempt_id"],
+            exam_id=raw["exam_id"],
+            user_id=raw["user_id"],
+            expires_at=datetime.fromisoformat(raw["expires_at"]),
+            options={qid: frozenset(opts) for qid, opts in raw["options"].items()},
+        )
+
+
+def seeded_shuffle(items: list, seed: str) -> list:
+    """Shuffle a copy of ``items``; the same seed gives the same order in every process."""
+    shuffled = list(items)
+    random.Random(seed).shuffle(shuffled)
+    return shuffled
+
+
+@dataclass(frozen=True)
+class ExamPaper:
+    """An exam paper kept as pre-serialized JSON fragments.
+
+    Each question is stored as the bytes before its options plus one
+    fragment per option, so a per-attempt ordering is assembled by
+    joining bytes instead of re-serializing the paper.
+    """
+    order: tuple[str, ...]
+    questions: dict[str, tuple[bytes, tuple[bytes, ...]]]  # question_id -> (head, options)
+
+    def render(self, order: list[str] | None = None, seed: str | None = None) -> bytes:
+        parts = []
+        for question_id in order or self.order:
+            head, options = self.questions[question_id]
+            if seed is not None:
+                options = seeded_shuffle(options, f"{seed}:{question_id}")
+            parts.append(head + b",".join(options) + b"]}")
+        return b"[" + b",".join(parts) + b"]"
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "order": list(self.order),
+            "questions": {
+                qid: [head.decode("utf-8"), [option.decode("utf-8") for option in options]]
+                for qid, (head, options) in self.questions.items()
+            },
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "ExamPaper":
+        raw = json.loads(data)
+        return cls(
+            order=tuple(raw["order"]),
+            questions={
+                qid: (head.encode("utf-8"), tuple(option.encode("utf-8") for option in options))
+                for qid, (head, options) in raw["questions"].items()
+            },
+        )
+
+
+class AttemptSessionCache(StoreCache):
+
+    def get(self, attempt_id: str) -> AttemptSession | None:
+        return super().get(attempt_id)
+
+    def set(self, session: AttemptSession) -> None:
+        # entries expire together with the attempt
+        ttl = int((session.expires_at - datetime.now(timezone.utc)).total_seconds())
+        super().set(session.attempt_id, session, ttl)
+
+
+class ExamPaperCache(StoreCache):
+    """Pre-serialized exam papers keyed by exam id."""
+
+    def get(self, exam_id: str) -> ExamPaper | None:
+        return super().get(exam_id)
+
+    def set(self, exam_id: str, paper: ExamPaper) -> None:
+        super().set(exam_id, paper)
+
+
+class ExamCache(StoreCache):
+    """Exam metadata keyed by exam id; a miss reads the database once however many requests share it."""
+
+    def get_or_load(self, exam_id: str, load: Callable[[], ExamResponse | None]) -> ExamResponse | None:
+        return super().get_or_load(exam_id, load, settings.EXAM_CACHE_TTL)
+
+
+attempt_sessions = AttemptSessionCache(
+    build_store(
+        settings.ATTEMPT_SESSION_BACKEND,
+        "attempt_session:",
+        settings.ATTEMPT_SESSION_CACHE_SIZE,
+        dumps=AttemptSession.to_json,
+        loads=AttemptSession.from_json,
+    ),
+    name="Attempt session",
+)
+
+exam_papers = ExamPaperCache(
+    build_store(
+        settings.EXAM_PAPER_BACKEND,
+        "exam_paper:",
+        settings.EXAM_PAPER_CACHE_SIZE,
+        dumps=ExamPaper.to_json,
+        loads=ExamPaper.from_json,
+    ),
+    name="Exam paper",
+)
+
+exams = ExamCache(
+    build_store(
+        settings.EXAM_CACHE_BACKEND,
+        "exam:",
+        settings.EXAM_CACHE_SIZE,
+        dumps=ExamResponse.model_dump_json,
+        loads=ExamResponse.model_validate_json,
+        local_ttl=settings.EXAM_LOCAL_TTL,
+    ),
+    name="Exam",
+)
+
+
+def _previous(obj, attr: str) -> list:
+    """The values ``attr`` had before this flush, so a row moved away is dropped from its old parent too."""
+    return [value for value in inspect(obj).attrs[attr].history.deleted if value is not None]
+
+
+def _question_exams(question) -> list[str]:
+    return [question.exam_id, *_previous(question, "exam_id")]
+
+
+def _option_exams(option) -> list[str]:
+    question = option.question
+    exam_ids = [question.exam_id] if question is not None else []
+    exam_ids += [previous.exam_id for previous in _previous(option, "question")]
+
+    question_ids = _previous(option, "question_id")
+    if question_ids:
+        # a plain read on the flushing connection, no autoflush
+        exam_ids += object_session(option).connection().scalars(
+            select(Question.exam_id).where(Question.id.in_(question_ids))
+        ).all()
+    return exam_ids
+
+
+# Updates, deletes and visibility changes drop the cached exam once committed;
+# so do changes to the questions and options of a published paper.
+invalidations.watch(Exam, "exam", lambda exam: [exam.id])
+invalidations.subscribe("exam", exams.invalidate)
+invalidations.watch(ExamQuestion, "exam_paper", lambda link: [link.exam_id])
+invalidations.watch(Question, "exam_paper", _question_exams)
+invalidations.watch(Option, "exam_paper", _option_exams)
+invalidations.subscribe("exam_paper", exam_papers.invalidate)
+# a submitted attempt stops taking answers
+invalidations.watch(ExamAttempt, "attempt_session", lambda attempt: [attempt.id] if attempt.is_completed else [])
+invalidations.subscribe("attempt_session", attempt_sessions.invalidate)
@@ -5,4 +5,28 @@ class ExamNotFoundError(Exception):
 
 
 class ExamAlreadyExistsError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class ExamNotAvailableError(Exception):
+    pass
+
+
+class AttemptNotFoundError(Exception):
+    pass
+
+
+class AttemptAccessDeniedError(Exception):
+    pass
+
+
+class AttemptCompletedError(Exception):
+    pass
+
+
+class AttemptExpiredError(Exception):
+    pass
+
+
+class InvalidAnswerError(Exception):
+    pass
@@ -3,7 +3,7 @@ from pydantic import BaseModel, EmailStr
 from uuid import UUID
 from typing import Optional, List
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship, Mapped, mapped_column
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Float, Text, Enum as SQLEnum, JSON, Interval, Computed
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Float, Text, Enum as SQLEnum, JSON, Interval, Computed, UniqueConstraint, Index
 
 from datetime import datetime
 from enum import Enum
@@ -26,8 +26,15 @@ EXAM_TYPE_LABELS = {
 }
 
 
+class AttemptStatusEnum(str, Enum):
+    IN_PROGRESS = "IN_PROGRESS"
+    COMPLETED = "COMPLETED"
+    EXPIRED = "EXPIRED"
+
+
 class Exam(Base):
     __tablename__ = "exam"
+    __table_args__ = (Index("ix_exam_created_at_id", "created_at", "id"),)
     id: Mapped[str] = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     title: Mapped[str] = Column(String(255), nullable=False)
     program_id: Mapped[str] = mapped_column(String(36), ForeignKey('programs.id'), nullable=False)
@@ -41,9 +48,9 @@ class Exam(Base):
     start_time = Column(DateTime, nullable=True) # when exam becomes visible
     end_time = Column(DateTime, nullable=False, index=True,)  # when exam closes
     # end_time = Column(DateTime, Computed("start_time + (duration_minutes * interval '1 minute')", persisted=True), nullable=False, index=True,)
-    created_at = Column(DateTime, default=datetime.utcnow())
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     created_by: Mapped[str] = Column(String(36), ForeignKey('users.id'), nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow())
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
     # relationships
     exam_questions: Mapped[List["ExamQuestion"]] = relationship("ExamQuestion", back_populates="exam", cascade="all, delete-orphan")
@@ -66,6 +73,7 @@ class ExamQuestion(Base):
 
 class ExamAttempt(Base):
     __tablename__ = "exam_attempt"
+    __table_args__ = (Index("ix_exam_attempt_exam_id_created_at_id", "exam_id", "created_at", "id"),)
     id: Mapped[str] = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = Column(String(36), ForeignKey('users.id'), nullable=False)
     exam_id: Mapped[str] = Column(String(36), ForeignKey('exam.id'), nullable=False)
@@ -80,7 +88,7 @@ class ExamAttempt(Base):
 
     completed_at: Mapped[Optional[DateTime]] = Column(DateTime(timezone=True), nullable=True)
     status: Mapped[str] = Column(String(50), nullable=False) # IN_PROGRESS, COMPLETED, EXPIRE
-    created_at: Mapped[DateTime] = Column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[DateTime] = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at: Mapped[DateTime] = Column(DateTime(timezone=True), default=datetime.utcnow)
     
     # relationships
@@ -92,6 +100,8 @@ class ExamAttempt(Base):
 
 class AttemptQuestion(Base):
     __tablename__ = "attempt_question"
+    __table_args__ = (UniqueConstraint("attempt_id", "order_index", name="uq_attempt_question_order"),)
+
     id: Mapped[str] = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     attempt_id: Mapped[str] = Column(String(36), ForeignKey('exam_attempt.id'), nullable=False)
     question_id: Mapped[str] = Column(String(36), ForeignKey('questions.id'), nullable=False)
@@ -105,6 +115,8 @@ class AttemptQuestion(Base):
 
 class UserAnswer(Base):
     __tablename__ = "user_answers"
+    __table_args__ = (UniqueConstraint("attempt_id", "question_id", name="uq_user_answer_attempt_question"),)
+
     id: Mapped[str] = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     attempt_id: Mapped[str] = Column(String(36), ForeignKey('exam_attempt.id'), nullable=False)    
     question_id: Mapped[str] = Column(String(36), ForeignKey('questions.id'), nullable=False)
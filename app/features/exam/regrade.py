@@ -0,0 +1,53 @@
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.features.jobs.queue import JobContext, job_handler
+from app.infrastructure.metrics import GRADED_ATTEMPTS, GRADING_DURATION
+from .grading import GradingEngine
+from .models import ExamAttempt
+
+
+@job_handler("regrade")
+def run_regrade(ctx: JobContext) -> dict:
+    """Re-grade every completed attempt of the job's exam, one committed chunk at a time.
+
+    Chunks walk the attempts by id (keyset), so a failure leaves earlier
+    chunks graded and the job can simply be started again.
+    """
+    exam_id = ctx.payload["exam_id"]
+    chunk_size = ctx.payload.get("chunk_size") or settings.REGRADE_CHUNK_SIZE
+    processed = 0
+
+    with ctx.session_factory() as db:
+        scope = GradingEngine.exam_scope(exam_id)
+        total = db.scalar(select(func.count()).select_from(scope.subquery()))
+        ctx.progress(0, total)
+
+        engine = GradingEngine(db)
+        last_id = ""
+        while True:
+            attempt_ids = list(db.scalars(
+                select(ExamAttempt.id)
+                .where(
+                    ExamAttempt.exam_id == exam_id,
+                    ExamAttempt.is_completed == True,
+                    ExamAttempt.id > last_id,
+                )
+                .order_by(ExamAttempt.id)
+                .limit(chunk_size)
+            ))
+            if not attempt_ids:
+                break
+
+            with GRADING_DURATION.labels("regrade").time():
+                engine.grade(GradingEngine.exam_scope(exam_id, attempt_ids))
+                db.commit()
+            GRADED_ATTEMPTS.labels("regrade").inc(len(attempt_ids))
+
+            processed += len(attempt_ids)
+            last_id = attempt_ids[-1]
+            ctx.progress(processed)
+            logger.info(f"Regrade {ctx.job_id} | exam {exam_id} | {processed}/{total}")
+
+    return {"exam_id": exam_id, "graded": processed}
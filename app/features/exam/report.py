@@ -0,0 +1,109 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Callable, Iterator
+
+from openpyxl import Workbook
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..school.models import Program
+from ..user.models import User, Student
+from .models import ExamAttempt, ExamQuestion, UserAnswer
+
+
+REPORT_BATCH_SIZE = 1000
+ATTEMPT_COLUMNS = [
+    "attempt_id", "user_id", "username", "email", "enrollment_number", "program",
+    "status", "started_at", "completed_at", "score", "is_passed",
+]
+
+
+def _question_ids(db: Session, exam_id: str) -> list[str]:
+    # the exam's own order, as on the published paper
+    return list(db.scalars(
+        select(ExamQuestion.question_id).where(ExamQuestion.exam_id == exam_id).order_by(ExamQuestion.id)
+    ))
+
+
+def iter_result_rows(db: Session, exam_id: str, batch_size: int = REPORT_BATCH_SIZE) -> Iterator[list]:
+    """The header, then one row per attempt: metadata, score and 1/0 per question (blank if unanswered).
+
+    Attempts come off a server-side cursor ``batch_size`` at a time and
+    the answers are read per batch, so memory does not grow with the sitting.
+    """
+    question_ids = _question_ids(db, exam_id)
+    yield ATTEMPT_COLUMNS + [f"Q{index}" for index in range(1, len(question_ids) + 1)]
+
+    stmt = (
+        select(
+            ExamAttempt.id, ExamAttempt.user_id, User.username, User.email,
+            Student.enrollment_number, Program.name, ExamAttempt.status,
+            ExamAttempt.started_at, ExamAttempt.completed_at, ExamAttempt.score, ExamAttempt.is_passed,
+        )
+        .join(User, User.id == ExamAttempt.user_id)
+        .outerjoin(Student, Student.user_id == User.id)
+        .outerjoin(Program, Program.id == Student.program_id)
+        .where(ExamAttempt.exam_id == exam_id)
+        .order_by(ExamAttempt.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    for attempts in db.execute(stmt).partitions():
+        correct: dict[str, dict[str, bool]] = {}
+        # grading leaves a blank row for every unanswered question
+        for attempt_id, question_id, is_correct in db.execute(
+            select(UserAnswer.attempt_id, UserAnswer.question_id, UserAnswer.is_correct)
+            .where(
+                UserAnswer.attempt_id.in_([attempt[0] for attempt in attempts]),
+                UserAnswer.selected_option_id.is_not(None),
+            )
+        ):
+            correct.setdefault(attempt_id, {})[question_id] = is_correct
+
+        for attempt in attempts:
+            answers = correct.get(attempt[0], {})
+            marks = [
+                "" if question_id not in answers else int(bool(answers[question_id]))
+                for question_id in question_ids
+            ]
+            yield list(attempt) + marks
+
+
+def stream_results_csv(session_factory: Callable[[], Session], exam_id: str) -> Iterator[str]:
+    """CSV text, one chunk per batch of attempts."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    with session_factory() as db:
+        for index, row in enumerate(iter_result_rows(db, exam_id), start=1):
+            writer.writerow(row)
+            if index % REPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_results_xlsx(session_factory: Callable[[], Session], exam_id: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """An XLSX workbook built in write-only mode, spooled to a temporary file and streamed from it.
+
+    The zip directory comes last in the file, so nothing can be sent before
+    every row is written; write-only mode keeps the rows out of memory.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Results")
+    with session_factory() as db:
+        for row in iter_result_rows(db, exam_id):
+            # Excel has no time zones; every timestamp is stored as UTC
+            sheet.append([
+                value.replace(tzinfo=None) if isinstance(value, datetime) else value
+                for value in row
+            ])
+
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while chunk := spool.read(chunk_size):
+            yield chunk
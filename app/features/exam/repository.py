@@ -1,7 +1,10 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Boolean, Float, String, select, delete, exists, insert, literal, union_all
 from uuid import UUID
-from .models import Exam
+import uuid
+from app.core.pagination import Page, PageParams, paginate
+from .models import Exam, ExamAttempt, ExamQuestion, AttemptQuestion, UserAnswer
+from ..question.models import Question, Option
 
 
 class ExamRepository:
@@ -15,9 +18,9 @@ class ExamRepository:
         stmt = select(Exam).where(Exam.title == title)
         return self.db.scalar(stmt)
 
-    def list(self, skip: int = 0, limit: int = 20):
-        stmt = select(Exam).offset(skip).limit(limit)
-        return self.db.scalars(stmt).all()
+    def get_page(self, params: PageParams, *criteria) -> Page:
+        stmt = select(Exam).where(*criteria)
+        return paginate(self.db, stmt, params, Exam.created_at, Exam.id)
 
     def create(self, exam: Exam) -> Exam:
         self.db.add(exam)
@@ -28,4 +31,120 @@ class ExamRepository:
 
     def update(self, exam:Exam):
         self.db.add(exam)
-        return exam 
\ No newline at end of file
+        return exam
+
+
+class ExamAttemptRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, attempt_id: str) -> ExamAttempt | None:
+        return self.db.get(ExamAttempt, attempt_id)
+
+    def get_page(self, exam_id: str, params: PageParams, *criteria) -> Page:
+        stmt = select(ExamAttempt).where(ExamAttempt.exam_id == exam_id, *criteria)
+        return paginate(self.db, stmt, params, ExamAttempt.created_at, ExamAttempt.id)
+
+    def get_open_attempt(self, exam_id: str, user_id: str) -> ExamAttempt | None:
+        stmt = select(ExamAttempt).where(
+            ExamAttempt.exam_id == exam_id,
+            ExamAttempt.user_id == user_id,
+            ExamAttempt.is_completed == False,
+        )
+        return self.db.scalar(stmt)
+
+    def create(self, attempt: ExamAttempt) -> ExamAttempt:
+        self.db.add(attempt)
+        return attempt
+
+    def get_exam_questions(self, exam_id: str) -> list[Question]:
+        stmt = (
+            select(Question)
+            .join(ExamQuestion, ExamQuestion.question_id == Question.id)
+            .where(ExamQuestion.exam_id == exam_id)
+            .order_by(ExamQuestion.id)
+            .options(selectinload(Question.options))
+        )
+        return list(self.db.scalars(stmt))
+
+    def create_attempt_questions(self, attempt_id: str, question_ids: list[str]) -> None:
+        """Materialize the attempt's question order with one bulk insert."""
+        rows = [
+            {"id": str(uuid.uuid4()), "attempt_id": attempt_id, "question_id": question_id, "order_index": index}
+            for index, question_id in enumerate(question_ids)
+        ]
+        if rows:
+            self.db.execute(insert(AttemptQuestion), rows)
+
+    def get_question_order(self, attempt_id: str) -> list[str]:
+        stmt = (
+            select(AttemptQuestion.question_id)
+            .where(AttemptQuestion.attempt_id == attempt_id)
+            .order_by(AttemptQuestion.order_index)
+        )
+        return list(self.db.scalars(stmt))
+
+    def get_answers(self, attempt_id: str) -> list[UserAnswer]:
+        stmt = select(UserAnswer).where(UserAnswer.attempt_id == attempt_id)
+        return list(self.db.scalars(stmt))
+
+    def get_option_map(self, exam_id: str) -> dict[str, frozenset[str]]:
+        """Map every question of the exam to the ids of its options."""
+        stmt = (
+            select(ExamQuestion.question_id, Option.id)
+            .outerjoin(Option, Option.question_id == ExamQuestion.question_id)
+            .where(ExamQuestion.exam_id == exam_id)
+        )
+
+        options: dict[str, set[str]] = {}
+        for question_id, option_id in self.db.execute(stmt):
+            question_options = options.setdefault(question_id, set())
+            if option_id is not None:
+                question_options.add(option_id)
+        return {question_id: frozenset(ids) for question_id, ids in options.items()}
+
+    def upsert_answers(self, attempt_id: str, answers: dict[str, str | None]) -> int:
+        """Insert or overwrite the selected option of every ``question_id -> option_id`` pair in one statement.
+
+        Nothing is written once the attempt is completed, whatever a cached
+        session says; returns the number of rows written.
+        """
+        if not answers:
+            return 0
+
+        in_progress = exists().where(ExamAttempt.id == attempt_id, ExamAttempt.is_completed == False)
+        columns = ["id", "attempt_id", "question_id", "selected_option_id", "marks_awarded", "is_correct"]
+        rows = union_all(*(
+            select(
+                literal(str(uuid.uuid4()), String),
+                literal(attempt_id, String),
+                literal(question_id, String),
+                literal(option_id, String),
+                literal(0.0, Float),
+                literal(False, Boolean),
+            ).where(in_progress)
+            for question_id, option_id in answers.items()
+        ))
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # no native upsert: replace the answered rows instead
+            self.db.execute(
+                delete(UserAnswer).where(
+                    UserAnswer.attempt_id == attempt_id,
+                    UserAnswer.question_id.in_(list(answers)),
+                    in_progress,
+                )
+            )
+            return self.db.execute(UserAnswer.__table__.insert().from_select(columns, rows)).rowcount
+
+        stmt = insert(UserAnswer).from_select(columns, rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserAnswer.attempt_id, UserAnswer.question_id],
+            set_={"selected_option_id": stmt.excluded.selected_option_id},
+        )
+        return self.db.execute(stmt).rowcount
@@ -1,16 +1,63 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.infrastructure.database import get_db
-from .services import ExamService
-from .schemas import ExamCreateRequest, ExamResponse, ExamUpdateRequest
-from .exception import ExamNotFoundError, ExamAlreadyExistsError
+from app.core.pagination import Page, PageParams, page_params
+from app.infrastructure.database import get_async_db, get_db
+from app.api.deps.user import get_current_user_async, get_user
+from app.features.auth.models import PermissionName
+from app.features.auth.principal import Principal
+from app.features.auth.role_checker import PermissionChecker
+from app.features.jobs.queue import jobs
+from app.features.jobs.schemas import JobResponse
+from app.features.question.importer import save_upload
+from .models import Exam, AttemptStatusEnum, ExamTypeEnum
+from .report import stream_results_csv, stream_results_xlsx
+from .services import ExamService, ExamAttemptService, AsyncExamAttemptService
+from .schemas import (
+    ExamCreateRequest,
+    ExamResponse,
+    ExamUpdateRequest,
+    ExamAttemptResponse,
+    AttemptQuestionResponse,
+    AnswerSubmitRequest,
+    BatchAnswerSubmitRequest,
+    BatchAnswerSubmitResponse,
+    AttemptResultResponse,
+)
+from .exception import (
+    ExamNotFoundError,
+    ExamAlreadyExistsError,
+    ExamNotAvailableError,
+    AttemptNotFoundError,
+    AttemptAccessDeniedError,
+    AttemptCompletedError,
+    AttemptExpiredError,
+    InvalidAnswerError,
+)
 
 router = APIRouter(prefix="/exams", tags=["Exams"])
 
 
+ATTEMPT_ERRORS = {
+    ExamNotFoundError: (status.HTTP_404_NOT_FOUND, "Exam not found"),
+    ExamNotAvailableError: (status.HTTP_403_FORBIDDEN, "Exam not available"),
+    AttemptNotFoundError: (status.HTTP_404_NOT_FOUND, "Attempt not found"),
+    AttemptAccessDeniedError: (status.HTTP_403_FORBIDDEN, "Unauthorized access"),
+    AttemptCompletedError: (status.HTTP_400_BAD_REQUEST, "Exam already submitted"),
+    AttemptExpiredError: (status.HTTP_400_BAD_REQUEST, "Time expired"),
+    InvalidAnswerError: (status.HTTP_400_BAD_REQUEST, "Invalid question"),
+}
+
+
+def attempt_http_exception(exc: Exception) -> HTTPException:
+    status_code, detail = ATTEMPT_ERRORS[type(exc)]
+    return HTTPException(status_code=status_code, detail=str(exc) or detail)
+
+
 
 
 @router.post("/", response_model=ExamResponse)
@@ -31,11 +78,17 @@ def create_exam(
         )
 
 
-@router.get("/all", response_model=List[ExamResponse])
-def get_exams(skip=False, limit=20, db:Session=Depends(get_db)):
+@router.get("/all", response_model=Page[ExamResponse])
+def get_exams(
+    params: PageParams = Depends(page_params),
+    program_id: Optional[str] = None,
+    exam_type: Optional[ExamTypeEnum] = None,
+    is_visible: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
     try:
         service = ExamService(db)
-        exams = service.get_exams(skip=skip, limit=limit)
+        exams = service.get_exams(params, program_id=program_id, exam_type=exam_type, is_visible=is_visible)
         return exams 
     except Exception as e:
         raise HTTPException(
@@ -70,6 +123,20 @@ def update_exam(exam_id: UUID, exam_data: ExamUpdateRequest, db:Session=Depends(
             detail="Exam not found"
         )
 
+@router.put("/{exam_id}/visibility", response_model=ExamResponse)
+def set_exam_visibility(exam_id: UUID, visible: bool, db: Session = Depends(get_db)):
+    service = ExamService(db)
+
+    try:
+        return service.set_visibility(str(exam_id), visible)
+
+    except ExamNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exam not found"
+        )
+
+
 @router.post("/{exam_id}/add-questions")
 def add_exam_questions(exam_id: UUID, questions: List[str], db:Session=Depends(get_db)):
     try:
@@ -86,4 +153,150 @@ def add_exam_questions(exam_id: UUID, questions: List[str], db:Session=Depends(g
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error - {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/{exam_id}/upload-questions", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def upload_exam_questions(exam_id: UUID, file: UploadFile, db: Session = Depends(get_db), user: Principal = Depends(get_user)):
+    """Queue a plain-text MCQ import into the exam's question bank.
+
+    Blocks are separated by blank lines; valid blocks are saved and the
+    invalid ones end up in the job result's ``errors`` with their block and
+    line number.
+    """
+    if not file.filename.endswith(".txt"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only .txt files allowed"
+        )
+
+    if db.get(Exam, str(exam_id)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exam not found"
+        )
+
+    path = save_upload(file.file, ".txt")
+    return jobs.submit(db, "question_import", {"exam_id": str(exam_id), "path": path, "format": "text"}, user_id=user.id)
+
+
+@router.get("/{exam_id}/results/export", dependencies=[Depends(PermissionChecker(PermissionName.GENERATE_REPORT))])
+def export_exam_results(exam_id: UUID, format: Literal["csv", "xlsx"] = "csv", db: Session = Depends(get_db)):
+    """Every attempt's score and per-question correctness, streamed as CSV or XLSX."""
+    if db.get(Exam, str(exam_id)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exam not found"
+        )
+
+    # the stream outlives the request session, so it reads through its own
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+    if format == "xlsx":
+        content = stream_results_xlsx(session_factory, str(exam_id))
+        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        content = stream_results_csv(session_factory, str(exam_id))
+        media_type = "text/csv"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="exam-{exam_id}-results.{format}"'},
+    )
+
+
+@router.get("/{exam_id}/attempts", response_model=Page[ExamAttemptResponse])
+def list_exam_attempts(
+    exam_id: UUID,
+    params: PageParams = Depends(page_params),
+    status_filter: Optional[AttemptStatusEnum] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+):
+    service = ExamAttemptService(db)
+
+    try:
+        return service.list_attempts(str(exam_id), params, status_filter)
+
+    except ExamNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exam not found"
+        )
+
+
+@router.post(
+    "/{exam_id}/regrade",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(PermissionChecker(PermissionName.CREATE_EXAM))],
+)
+def regrade_exam_attempts(exam_id: UUID, db: Session = Depends(get_db), user: Principal = Depends(get_user)):
+    service = ExamAttemptService(db)
+
+    try:
+        return service.create_regrade_job(str(exam_id), user.id)
+
+    except ExamNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exam not found"
+        )
+
+
+@router.post("/{exam_id}/start", response_model=ExamAttemptResponse)
+async def student_start_exam(exam_id: UUID, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_user_async)):
+    service = AsyncExamAttemptService(db)
+
+    try:
+        return await service.start_attempt(str(exam_id), user.id)
+
+    except tuple(ATTEMPT_ERRORS) as e:
+        raise attempt_http_exception(e)
+
+
+@router.get("/attempts/{attempt_id}/questions", response_model=List[AttemptQuestionResponse])
+async def student_exam_attempted_questions(attempt_id: str, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_user_async)):
+    service = AsyncExamAttemptService(db)
+
+    try:
+        paper = await service.get_attempt_paper(attempt_id, user.id)
+        return Response(content=paper, media_type="application/json")
+
+    except tuple(ATTEMPT_ERRORS) as e:
+        raise attempt_http_exception(e)
+
+
+@router.post("/attempts/{attempt_id}/answer")
+async def student_exam_attempted_answers(attempt_id: str, data: AnswerSubmitRequest, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_user_async)):
+    service = AsyncExamAttemptService(db)
+
+    try:
+        await service.save_answer(attempt_id, user.id, data)
+        return {"message": "Answer saved"}
+
+    except tuple(ATTEMPT_ERRORS) as e:
+        raise attempt_http_exception(e)
+
+
+@router.post("/attempts/{attempt_id}/answers", response_model=BatchAnswerSubmitResponse)
+async def student_exam_attempted_answers_batch(attempt_id: str, data: BatchAnswerSubmitRequest, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_user_async)):
+    service = AsyncExamAttemptService(db)
+
+    try:
+        saved = await service.save_answers(attempt_id, user.id, data.answers)
+        return {"message": "Answers saved", "saved": saved}
+
+    except tuple(ATTEMPT_ERRORS) as e:
+        raise attempt_http_exception(e)
+
+
+@router.post("/attempts/{attempt_id}/submit", response_model=AttemptResultResponse)
+async def submit_exam_attempt(attempt_id: str, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(get_current_user_async)):
+    service = AsyncExamAttemptService(db)
+
+    try:
+        result = await service.submit_attempt(attempt_id, user.id)
+        return {"message": "Exam submitted successfully", **result}
+
+    except tuple(ATTEMPT_ERRORS) as e:
+        raise attempt_http_exception(e)
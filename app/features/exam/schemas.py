@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from pydantic import BaseModel, ConfigDict, Field, field_validator
-from typing import Literal, Optional, List, Dict
+from typing import Any, Literal, Optional, List, Dict
 from uuid import uuid4, UUID
 from enum import Enum
 from app.models.exam import ExamTypeEnum
@@ -116,7 +116,57 @@ class MCQCreateRequest(BaseModel):
 
 class AnswerSubmitRequest(BaseModel):
     question_id: UUID
-    selected_option: str
+    selected_option: Optional[str] = Field(None, description="ID of the chosen option, null clears the answer")
+
+
+class BatchAnswerSubmitRequest(BaseModel):
+    answers: List[AnswerSubmitRequest] = Field(..., min_length=1, max_length=500)
+
+    @field_validator("answers")
+    @classmethod
+    def validate_unique_questions(cls, value):
+        ids = [a.question_id for a in value]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Duplicate question IDs are not allowed")
+        return value
+
+
+class BatchAnswerSubmitResponse(BaseModel):
+    message: str
+    saved: int
+
+
+class ExamAttemptResponse(BaseModel):
+    id: UUID | str
+    exam_id: UUID | str
+    user_id: UUID | str
+    status: str
+    started_at: datetime
+    expires_at: datetime
+    is_completed: bool
+    model_config=ConfigDict(from_attributes=True)
+
+
+class AttemptOptionResponse(BaseModel):
+    id: UUID | str
+    label: str
+    content: Any
+    model_config=ConfigDict(from_attributes=True)
+
+
+class AttemptQuestionResponse(BaseModel):
+    id: UUID | str
+    content: Any
+    marks: Optional[int] = None
+    options: List[AttemptOptionResponse]
+    model_config=ConfigDict(from_attributes=True)
+
+
+class AttemptResultResponse(BaseModel):
+    message: str
+    score: float
+    maximum_marks: Optional[int]
+    completed_at: datetime
 
 
 class ExamQuestionItem(BaseModel):
@@ -1,101 +1,69 @@
-from app.infrastructure.cache_manager import CacheManager
 import uuid
 from datetime import datetime, timedelta, timezone
+from typing import List
+
+from pydantic import TypeAdapter
 
 from sqlalchemy.orm import Session
-from app.infrastructure.redis import redis_client
-from app.infrastructure.cache_utils import serialize, deserialize
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams
+from app.infrastructure.metrics import GRADED_ATTEMPTS, GRADING_DURATION
 from app.models.question import Question
-from .repository import ExamRepository
-from .models import Exam
-from .exception import ExamNotFoundError, ExamAlreadyExistsError
-from .schemas import ExamResponse, ExamCreateRequest, ExamUpdateRequest
+from .repository import ExamRepository, ExamAttemptRepository
+from .cache import AttemptSession, ExamPaper, attempt_sessions, exam_papers, exams, seeded_shuffle
+from .grading import GradingEngine
+from app.features.jobs.models import Job
+from app.features.jobs.queue import jobs
+from . import regrade  # registers the "regrade" job handler
+from .models import Exam, ExamAttempt, AttemptStatusEnum, ExamTypeEnum
+from .exception import (
+    ExamNotFoundError,
+    ExamAlreadyExistsError,
+    ExamNotAvailableError,
+    AttemptNotFoundError,
+    AttemptAccessDeniedError,
+    AttemptCompletedError,
+    AttemptExpiredError,
+    InvalidAnswerError,
+)
+from .schemas import ExamResponse, ExamCreateRequest, ExamUpdateRequest, AnswerSubmitRequest, AttemptQuestionResponse, ExamAttemptResponse
 from ..school.models import Program 
 class ExamService:
 
-    CACHE_TTL = 300  # 5 minutes
-
     def __init__(self, db: Session):
         self.db = db
         self.repo = ExamRepository(db)
 
-    def _cache_key(self, exam_id: uuid.UUID) -> str:
-        return f"exam:{exam_id}"
-    
-
-    # def __init__(self, repo, cache: CacheManager):
-    #     self.repo = repo
-    #     self.cache = cache
-
-    # def get_exam(self, exam_id: UUID) -> Exam:
-    #     cache_key = self._cache_key(exam_id)
-
-    #     # 1️⃣ Check Redis
-    #     cached = redis_client.get(cache_key)
-    #     if cached:
-    #         return deserialize(cached)
-
-    #     # 2️⃣ Fallback to DB
-    #     exam = self.repo.get_by_id(exam_id)
-    #     if not exam:
-    #         raise ExamNotFoundError()
-
-    #     # 3️⃣ Store in cache
-    #     redis_client.setex(
-    #         cache_key,
-    #         self.CACHE_TTL,
-    #         serialize({
-    #             "id": str(exam.id),
-    #             "title": exam.title,
-    #             "total_marks": exam.total_marks,
-    #         })
-    #     )
-
-    # async def get_exam(self, exam_id):
-    #     cache_key = f"exam:{exam_id}"
-
-    #     cached = await self.cache.get(cache_key)
-    #     if cached:
-    #         return cached
-
-    #     exam = await self.repo.get_exam(exam_id)
-    #     await self.cache.set(cache_key, exam.json(), ttl=600)
-    #     return exam
-
-    def get_exams(self, skip=False, limit=20):
-        return self.repo.list(skip=False, limit=limit)
+    def get_exams(self, params: PageParams, program_id: str | None = None, exam_type: ExamTypeEnum | None = None, is_visible: bool | None = None) -> Page:
+        criteria = []
+        if program_id is not None:
+            criteria.append(Exam.program_id == program_id)
+        if exam_type is not None:
+            criteria.append(Exam.exam_type == exam_type)
+        if is_visible is not None:
+            criteria.append(Exam.is_visible == is_visible)
+        return self.repo.get_page(params, *criteria)
 
     def get_exam(self, exam_id: uuid.UUID) -> ExamResponse:
-        cache_key = self._cache_key(exam_id)
+        def load() -> ExamResponse | None:
+            exam = self.repo.get_by_id(str(exam_id))
+            return ExamResponse.model_validate(exam) if exam else None
 
-        cached = redis_client.get(cache_key)
-        if cached:
-            return ExamResponse.model_validate_json(cached)
-
-        exam = self.repo.get_by_id(exam_id)
-        if not exam:
+        # when an exam opens every student asks for it at once; one of them reads it
+        response = exams.get_or_load(str(exam_id), load)
+        if response is None:
             raise ExamNotFoundError()
-
-        response = ExamResponse.model_validate(exam)
-
-        redis_client.setex(
-            cache_key,
-            self.CACHE_TTL,
-            response.model_dump_json()
-        )
-
         return response
-    
+
     def delete_exam(self, exam_id: uuid.UUID):
-        exam = self.repo.get_by_id(exam_id)
+        exam = self.repo.get_by_id(str(exam_id))
         if not exam:
             raise ExamNotFoundError()
 
+        # the cached exam is dropped when the deletion commits
         self.repo.delete(exam)
         self.db.flush()
 
-        redis_client.delete(self._cache_key(exam_id))
-
 
     def create_exam(self, exam_data: ExamCreateRequest) -> Exam:
         # 🔹 1. Business validations
@@ -146,25 +114,34 @@ class ExamService:
             raise
 
     
-    def update_exam(self, exam_id: str, exam_data: ExamUpdateRequest):
-        existing = self.db.query(Exam).filter(Exam.id==exam_id).first()
+    def update_exam(self, exam_id: str, exam_data: ExamUpdateRequest) -> Exam:
+        existing = self.repo.get_by_id(str(exam_id))
         if not existing:
-            raise ValueError("Exam not found!")
-        
-        updated_exam = Exam(
-            title=exam_data.title,
-            program_id=exam_data.program_id,
-            maximum_marks=exam_data.maximum_marks,
-            duration_minutes=exam_data.duration_minutes,
-            duration=exam_data.duration,
-            is_visible=exam_data.is_visible,
-            exam_type=exam_data.exam_type,
-            description=exam_data.description,
-            start_time=exam_data.start_time,
-            end_time=exam_data.end_time,
-            updated_at = datetime.now(timezone.utc),
-        )
-        self.repo.update(exam_data)
+            raise ExamNotFoundError()
+
+        for field, value in exam_data.model_dump(exclude={"id", "created_at", "updated_at", "questions"}).items():
+            setattr(existing, field, value)
+        existing.updated_at = datetime.now(timezone.utc)
+
+        # the cached exam is dropped when the update commits
+        self.repo.update(existing)
+        self.db.flush()
+        return existing
+
+    def set_visibility(self, exam_id: str, visible: bool) -> Exam:
+        exam = self.repo.get_by_id(exam_id)
+        if not exam:
+            raise ExamNotFoundError()
+
+        exam.is_visible = visible
+        self.db.flush()
+
+        # the paper is immutable once published, so serialize it exactly once
+        if visible:
+            publish_exam_paper(ExamAttemptRepository(self.db), exam.id)
+        else:
+            exam_papers.invalidate(exam.id)
+        return exam
 
     def add_questions(self, exam_id: str,  question_ids):
         exam = self.db.query(Exam).filter(Exam.id==exam_id).first()
@@ -179,5 +156,230 @@ class ExamService:
         ).all()
 
         exam.questions.extend(questions)
-        return exam 
-        
\ No newline at end of file
+        return exam
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; every timestamp is stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+_exam_paper_adapter = TypeAdapter(List[AttemptQuestionResponse])
+
+
+def publish_exam_paper(repo: ExamAttemptRepository, exam_id: str) -> ExamPaper:
+    """Serialize the exam's questions (without ``is_correct``) and cache the JSON fragments."""
+    questions = _exam_paper_adapter.validate_python(repo.get_exam_questions(exam_id), from_attributes=True)
+
+    fragments = {}
+    for question in questions:
+        # '{"id":...,"marks":...}' -> '{"id":...,"marks":...,"options":['
+        head = question.model_dump_json(exclude={"options"})[:-1] + ',"options":['
+        options = tuple(option.model_dump_json().encode("utf-8") for option in question.options)
+        fragments[str(question.id)] = (head.encode("utf-8"), options)
+
+    paper = ExamPaper(order=tuple(fragments), questions=fragments)
+    exam_papers.set(exam_id, paper)
+    return paper
+
+
+class ExamAttemptService:
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ExamAttemptRepository(db)
+        self.exam_repo = ExamRepository(db)
+
+    def _get_active_attempt(self, attempt_id: str, user_id: str, allow_expired: bool = False) -> ExamAttempt:
+        attempt = self.repo.get_by_id(attempt_id)
+        if not attempt:
+            raise AttemptNotFoundError()
+
+        if attempt.user_id != user_id:
+            raise AttemptAccessDeniedError()
+
+        if attempt.is_completed:
+            raise AttemptCompletedError()
+
+        if not allow_expired and _utcnow() > _as_utc(attempt.expires_at):
+            raise AttemptExpiredError()
+
+        return attempt
+
+    def _cache_session(self, attempt: ExamAttempt) -> AttemptSession:
+        session = AttemptSession(
+            attempt_id=attempt.id,
+            exam_id=attempt.exam_id,
+            user_id=attempt.user_id,
+            expires_at=_as_utc(attempt.expires_at),
+            options=self.repo.get_option_map(attempt.exam_id),
+        )
+        attempt_sessions.set(session)
+        return session
+
+    def _get_session(self, attempt_id: str, user_id: str) -> AttemptSession:
+        """Authorize an in-progress attempt, hitting the database only on a cache miss."""
+        session = attempt_sessions.get(attempt_id)
+        if session is None:
+            session = self._cache_session(self._get_active_attempt(attempt_id, user_id))
+
+        if session.user_id != user_id:
+            raise AttemptAccessDeniedError()
+
+        if session.is_expired(_utcnow()):
+            raise AttemptExpiredError()
+
+        return session
+
+    def start_attempt(self, exam_id: str, user_id: str) -> ExamAttempt:
+        exam = self.exam_repo.get_by_id(exam_id)
+        if not exam:
+            raise ExamNotFoundError()
+
+        if not exam.is_visible:
+            raise ExamNotAvailableError("Exam not available")
+
+        now = _utcnow()
+        if exam.start_time and now < _as_utc(exam.start_time):
+            raise ExamNotAvailableError("Exam has not started yet")
+
+        if exam.end_time and now > _as_utc(exam.end_time):
+            raise ExamNotAvailableError("Exam has ended")
+
+        # resume instead of opening a second attempt
+        existing = self.repo.get_open_attempt(exam_id, user_id)
+        if existing:
+            return existing
+
+        attempt = ExamAttempt(
+            id=str(uuid.uuid4()),
+            exam_id=exam_id,
+            user_id=user_id,
+            started_at=now,
+            expires_at=now + timedelta(minutes=exam.duration_minutes),
+            status=AttemptStatusEnum.IN_PROGRESS.value,
+            is_completed=False,
+        )
+        self.repo.create(attempt)
+        self.db.flush()
+
+        # warm the session so the first autosave skips the lookups
+        session = self._cache_session(attempt)
+
+        # the seed is the attempt id, so the order can always be rebuilt from it
+        question_ids = seeded_shuffle(sorted(session.options), attempt.id)
+        self.repo.create_attempt_questions(attempt.id, question_ids)
+        return attempt
+
+    def get_attempt_paper(self, attempt_id: str, user_id: str) -> bytes:
+        """Return the exam paper in the attempt's own question and option order as JSON bytes."""
+        session = self._get_session(attempt_id, user_id)
+
+        paper = exam_papers.get(session.exam_id)
+        if paper is None:
+            paper = publish_exam_paper(self.repo, session.exam_id)
+
+        # attempts started before shuffling have no rows and keep the exam order
+        order = [qid for qid in self.repo.get_question_order(session.attempt_id) if qid in paper.questions]
+        return paper.render(order, seed=session.attempt_id)
+
+    def save_answer(self, attempt_id: str, user_id: str, answer: AnswerSubmitRequest) -> int:
+        return self.save_answers(attempt_id, user_id, [answer])
+
+    def save_answers(self, attempt_id: str, user_id: str, answers: list[AnswerSubmitRequest]) -> int:
+        """Validate a batch of answers against the cached session and persist them with one upsert."""
+        session = self._get_session(attempt_id, user_id)
+
+        selections = {str(a.question_id): a.selected_option for a in answers}
+
+        for question_id, option_id in selections.items():
+            if not session.has_question(question_id):
+                raise InvalidAnswerError(f"Question {question_id} is not part of this exam")
+            if option_id and not session.has_option(question_id, option_id):
+                raise InvalidAnswerError(f"Option {option_id} does not belong to question {question_id}")
+
+        if not self.repo.upsert_answers(session.attempt_id, selections):
+            # submitted since the session was cached
+            attempt_sessions.invalidate(session.attempt_id)
+            raise AttemptCompletedError()
+        return len(selections)
+
+    def submit_attempt(self, attempt_id: str, user_id: str) -> ExamAttempt:
+        # late submissions are still graded, the timer only guards answering
+        attempt = self._get_active_attempt(attempt_id, user_id, allow_expired=True)
+
+        with GRADING_DURATION.labels("submit").time():
+            score = GradingEngine(self.db).grade_attempt(attempt.id)
+        GRADED_ATTEMPTS.labels("submit").inc()
+
+        now = _utcnow()
+        attempt.score = score
+        attempt.is_completed = True
+        attempt.is_graded = True
+        attempt.completed_at = now
+        attempt.updated_at = now
+        attempt.status = AttemptStatusEnum.COMPLETED.value
+
+        # the attempt session is dropped once this commits, in every worker
+        self.db.flush()
+        return attempt
+
+    def create_regrade_job(self, exam_id: str, user_id: str | None = None) -> Job:
+        exam = self.exam_repo.get_by_id(exam_id)
+        if not exam:
+            raise ExamNotFoundError()
+
+        return jobs.submit(self.db, "regrade", {"exam_id": exam.id}, user_id=user_id)
+
+    def list_attempts(self, exam_id: str, params: PageParams, status: AttemptStatusEnum | None = None) -> Page:
+        if not self.exam_repo.get_by_id(exam_id):
+            raise ExamNotFoundError()
+
+        criteria = [ExamAttempt.status == status] if status is not None else []
+        return self.repo.get_page(exam_id, params, *criteria)
+
+
+class AsyncExamAttemptService:
+    """The exam-taking path on an ``AsyncSession``.
+
+    Every call runs ``ExamAttemptService`` through ``AsyncSession.run_sync``:
+    its statements go through the async driver, so a worker keeps serving
+    other students while one waits on the database. Results are built inside
+    the call because lazy loads are not allowed once it returns.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def start_attempt(self, exam_id: str, user_id: str) -> ExamAttemptResponse:
+        def start(session: Session) -> ExamAttemptResponse:
+            attempt = ExamAttemptService(session).start_attempt(exam_id, user_id)
+            return ExamAttemptResponse.model_validate(attempt)
+
+        return await self.db.run_sync(start)
+
+    async def get_attempt_paper(self, attempt_id: str, user_id: str) -> bytes:
+        return await self.db.run_sync(lambda session: ExamAttemptService(session).get_attempt_paper(attempt_id, user_id))
+
+    async def save_answer(self, attempt_id: str, user_id: str, answer: AnswerSubmitRequest) -> int:
+        return await self.save_answers(attempt_id, user_id, [answer])
+
+    async def save_answers(self, attempt_id: str, user_id: str, answers: list[AnswerSubmitRequest]) -> int:
+        return await self.db.run_sync(lambda session: ExamAttemptService(session).save_answers(attempt_id, user_id, answers))
+
+    async def submit_attempt(self, attempt_id: str, user_id: str) -> dict:
+        def submit(session: Session) -> dict:
+            attempt = ExamAttemptService(session).submit_attempt(attempt_id, user_id)
+            return {
+                "score": attempt.score,
+                "maximum_marks": attempt.exam.maximum_marks,
+                "completed_at": attempt.completed_at,
+            }
+
+        return await self.db.run_sync(submit)
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text, JSON
+from sqlalchemy.orm import Mapped
+
+from app.infrastructure.base import Base
+
+
+class JobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class Job(Base):
+    """A unit of background work and its outcome; the row outlives the worker that ran it."""
+    __tablename__ = "jobs"
+    id: Mapped[str] = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    kind: Mapped[str] = Column(String(50), nullable=False, index=True)
+    status: Mapped[str] = Column(String(20), nullable=False, default=JobStatus.PENDING, index=True)
+    payload: Mapped[dict] = Column(JSON, nullable=False, default=dict)
+    result: Mapped[Optional[dict]] = Column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = Column(Text, nullable=True)
+    total: Mapped[int] = Column(Integer, nullable=False, default=0)
+    processed: Mapped[int] = Column(Integer, nullable=False, default=0)
+    created_by: Mapped[Optional[str]] = Column(String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)  # refreshed while RUNNING
+
+    @property
+    def progress(self) -> float:
+        if not self.total:
+            return 100.0 if self.status == JobStatus.COMPLETED else 0.0
+        return round(self.processed * 100 / self.total, 2)
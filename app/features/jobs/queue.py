@@ -0,0 +1,219 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.infrastructure.database import SessionLocal
+from app.infrastructure.metrics import JOBS_FINISHED
+from .models import Job, JobStatus
+
+
+_handlers: dict[str, Callable] = {}
+
+
+def job_handler(kind: str):
+    """Register ``func(ctx: JobContext) -> dict | None`` as the runner for ``kind`` jobs.
+
+    Handlers are synchronous and run on the threadpool; what they return is
+    stored as the job result.
+    """
+    def register(func):
+        _handlers[kind] = func
+        return func
+    return register
+
+
+@dataclass
+class JobContext:
+    job_id: str
+    payload: dict
+    session_factory: Callable[[], Session]
+
+    def progress(self, processed: int, total: int | None = None) -> None:
+        values = {"processed": processed}
+        if total is not None:
+            values["total"] = total
+        with self.session_factory() as db:
+            db.execute(update(Job).where(Job.id == self.job_id).values(**values))
+            db.commit()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _heartbeat(job_id: str, session_factory: Callable[[], Session], stopped: threading.Event) -> None:
+    """Mark the job alive every ``JOB_HEARTBEAT_INTERVAL`` seconds until ``stopped`` is set."""
+    while not stopped.wait(settings.JOB_HEARTBEAT_INTERVAL):
+        try:
+            with session_factory() as db:
+                db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+                    .values(heartbeat_at=_utcnow())
+                )
+                db.commit()
+        except Exception as e:
+            logger.warning(f"Heartbeat of job {job_id} failed: {e}")
+
+
+def run_job(job_id: str, session_factory: Callable[[], Session]) -> None:
+    """Claim a pending job, run its handler and record the outcome."""
+    with session_factory() as db:
+        # a conditional update, so two workers never run the same job
+        now = _utcnow()
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+            .values(status=JobStatus.RUNNING, started_at=now, heartbeat_at=now)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        job = db.get(Job, job_id)
+        kind, payload = job.kind, dict(job.payload)
+
+    values = {}
+    stopped = threading.Event()
+    threading.Thread(target=_heartbeat, args=(job_id, session_factory, stopped), name=f"job-heartbeat-{job_id}", daemon=True).start()
+    try:
+        handler = _handlers[kind]
+        result = handler(JobContext(job_id, payload, session_factory))
+        values.update(status=JobStatus.COMPLETED, result=result)
+        logger.info(f"Job {job_id} ({kind}) completed")
+    except Exception as e:
+        values.update(status=JobStatus.FAILED, error=str(e) or type(e).__name__)
+        logger.exception(f"Job {job_id} ({kind}) failed")
+    finally:
+        stopped.set()
+
+    values["finished_at"] = _utcnow()
+    with session_factory() as db:
+        db.execute(update(Job).where(Job.id == job_id).values(**values))
+        db.commit()
+    JOBS_FINISHED.labels(kind, values["status"]).inc()
+
+
+class JobQueue:
+    """Runs jobs on ``workers`` asyncio tasks, each handing its job to the threadpool.
+
+    The ``jobs`` table holds every job's state. With the ``"memory"``
+    backend the queue lives in this process and pending rows are picked up
+    again on start; with ``"redis"`` job ids go through a Redis list, so any
+    worker process can run them. A running job sends a heartbeat; one whose
+    process died stops sending it and is put back to PENDING and requeued
+    when a queue starts.
+    """
+
+    def __init__(self, workers: int, backend: str = "memory", session_factory: Callable[[], Session] | None = None):
+        self.workers = workers
+        self.backend = backend
+        self.session_factory = session_factory
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, db: Session, kind: str, payload: dict, user_id: str | None = None) -> Job:
+        """Record a job and queue it; the request returns without waiting for it."""
+        if kind not in _handlers:
+            raise ValueError(f"No handler for {kind} jobs")
+
+        job = Job(kind=kind, payload=payload, status=JobStatus.PENDING, created_by=user_id, created_at=_utcnow())
+        db.add(job)
+        # the worker reads the row from its own session
+        db.commit()
+
+        # the job runs against the engine of the session that submitted it
+        self._put(job.id, sessionmaker(bind=db.get_bind(), autoflush=False))
+        return job
+
+    def _put(self, job_id: str, session_factory: Callable[[], Session]) -> None:
+        if self.backend == "redis":
+            from app.infrastructure.redis import sync_redis_client
+            sync_redis_client.lpush(settings.JOB_QUEUE_KEY, job_id)
+            return
+
+        if self._loop is None:
+            raise RuntimeError("Job queue is not running")
+        # submit is called from the threadpool; asyncio.Queue is not thread-safe
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (job_id, session_factory))
+
+    async def _next(self) -> tuple[str, Callable[[], Session]]:
+        if self.backend == "redis":
+            from app.infrastructure.redis import redis_client
+            while True:
+                item = await redis_client.brpop(settings.JOB_QUEUE_KEY, timeout=5)
+                if item:
+                    return item[1], self.session_factory
+        return await self._queue.get()
+
+    async def _work(self) -> None:
+        while True:
+            job_id, session_factory = await self._next()
+            try:
+                await run_in_threadpool(run_job, job_id, session_factory)
+            except Exception:
+                logger.exception(f"Job {job_id} could not be run")
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        reclaimed = await run_in_threadpool(self._reclaim_stale_jobs)
+        if self.backend == "memory":
+            for job_id in await run_in_threadpool(self._pending_job_ids):
+                self._queue.put_nowait((job_id, self.session_factory))
+        else:
+            # the ids already left the Redis list when they were claimed
+            for job_id in reclaimed:
+                await run_in_threadpool(self._put, job_id, self.session_factory)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    def _reclaim_stale_jobs(self) -> list[str]:
+        """Put RUNNING jobs with no heartbeat for ``JOB_STALE_AFTER`` seconds back to PENDING."""
+        stale = (
+            Job.status == JobStatus.RUNNING,
+            # rows claimed before heartbeats were recorded only have started_at
+            func.coalesce(Job.heartbeat_at, Job.started_at) < _utcnow() - timedelta(seconds=settings.JOB_STALE_AFTER),
+        )
+        try:
+            with self.session_factory() as db:
+                job_ids = list(db.scalars(select(Job.id).where(*stale)))
+                if job_ids:
+                    # the same condition again, in case another process reclaimed them first
+                    db.execute(
+                        update(Job)
+                        .where(Job.id.in_(job_ids), *stale)
+                        .values(status=JobStatus.PENDING, started_at=None, heartbeat_at=None, processed=0)
+                    )
+                    db.commit()
+                    logger.warning(f"Requeued {len(job_ids)} jobs whose worker stopped: {job_ids}")
+                return job_ids
+        except Exception as e:
+            logger.warning(f"Reclaiming stale jobs failed: {e}")
+            return []
+
+    def _pending_job_ids(self) -> list[str]:
+        # jobs submitted before a restart; the claim in run_job skips any another process took
+        try:
+            with self.session_factory() as db:
+                return list(db.scalars(select(Job.id).where(Job.status == JobStatus.PENDING).order_by(Job.created_at)))
+        except Exception as e:
+            logger.warning(f"Loading pending jobs failed: {e}")
+            return []
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+
+jobs = JobQueue(settings.JOB_WORKERS, settings.JOB_QUEUE_BACKEND, SessionLocal)
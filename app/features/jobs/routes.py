@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps.user import get_user
+from app.features.auth.principal import Principal
+from app.features.auth.role_checker import STAFF_ROLES
+from app.infrastructure.database import get_db
+from .models import Job
+from .schemas import JobResponse
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_db), user: Principal = Depends(get_user)):
+    job = db.get(Job, job_id)
+    # only the user who queued the job, or staff, may see its payload and result
+    if not job or (job.created_by != user.id and user.roles.isdisjoint(STAFF_ROLES)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
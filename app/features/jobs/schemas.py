@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    total: int
+    processed: int
+    progress: float
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config=ConfigDict(from_attributes=True)
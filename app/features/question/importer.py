@@ -0,0 +1,242 @@
+import codecs
+import io
+import json
+import os
+import re
+import shutil
+import uuid
+from dataclasses import asdict
+from typing import BinaryIO, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.utils import MCQBlockError, iter_text_mcq
+from app.features.jobs.queue import JobContext, job_handler
+from .models import Question, Option
+from .schemas import QuestionUploadSchema
+from ..exam.cache import exam_papers
+from ..exam.models import ExamQuestion
+
+
+CHUNK_SIZE = 64 * 1024
+IMPORT_BATCH_SIZE = 1000
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"\s*")
+_wrapper = re.compile(r'\s*\{\s*"questions"\s*:\s*\[')
+
+
+class QuestionImportError(ValueError):
+    """An upload that cannot be parsed or an item that fails validation; nothing is written."""
+
+    def __init__(self, message: str, item: int | None = None):
+        self.item = item
+        super().__init__(message if item is None else f"Question {item}: {message}")
+
+
+def _read_text(stream: BinaryIO, chunk_size: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        yield decoder.decode(chunk)
+
+
+def iter_json_lines(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """One JSON object per line; blank lines are skipped."""
+    buffer = ""
+    for text in _read_text(stream, chunk_size):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        yield json.loads(buffer)
+
+
+def iter_json_array(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Items of a top-level array, or of ``{"questions": [...]}``, decoded one at a time.
+
+    Only the item being decoded and one read chunk are held in memory.
+    """
+    chunks = _read_text(stream, chunk_size)
+    buffer = ""
+
+    def fill() -> bool:
+        nonlocal buffer
+        text = next(chunks, None)
+        if text is None:
+            return False
+        buffer += text
+        return True
+
+    # find the opening bracket of the array
+    while True:
+        stripped = buffer.lstrip()
+        if stripped.startswith("["):
+            buffer = stripped[1:]
+            break
+        match = _wrapper.match(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        if (stripped and not stripped.startswith("{")) or len(stripped) > 64 or not fill():
+            raise QuestionImportError('Expected a JSON array or {"questions": [...]}')
+
+    pos, expect_item, empty = 0, True, True
+    while True:
+        pos = _whitespace.match(buffer, pos).end()
+        if pos == len(buffer):
+            buffer, pos = "", 0
+            if not fill():
+                raise QuestionImportError("Unexpected end of JSON array")
+            continue
+
+        char = buffer[pos]
+        if char == "]" and (not expect_item or empty):
+            return
+        if char == "," and not expect_item:
+            pos, expect_item = pos + 1, True
+            continue
+
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # the item may continue in the next chunk
+            buffer, pos = buffer[pos:], 0
+            if not fill():
+                raise QuestionImportError("Invalid JSON format")
+            continue
+
+        yield item
+        buffer, pos, expect_item, empty = buffer[end:], 0, False, False
+
+
+def _question_rows(exam_id: str, index: int, raw) -> tuple[dict, list[dict]]:
+    try:
+        item = QuestionUploadSchema.model_validate(raw)
+    except ValidationError as e:
+        raise QuestionImportError(str(e), index)
+
+    keys = [option.key for option in item.options]
+    if len(keys) < 2 or len(set(keys)) != len(keys):
+        raise QuestionImportError("At least two options with distinct keys required", index)
+    if item.correct_option not in keys:
+        raise QuestionImportError(f"Correct option {item.correct_option!r} is not one of {keys}", index)
+
+    question_id = str(uuid.uuid4())
+    question = {
+        "id": question_id,
+        "exam_id": exam_id,
+        "content": [{"type": "text", "value": item.content}],
+        "marks": item.marks,
+    }
+    options = [
+        {
+            "id": str(uuid.uuid4()),
+            "question_id": question_id,
+            "label": option.key,
+            "content": [{"type": "text", "value": option.text}],
+            "is_correct": option.key == item.correct_option,
+        }
+        for option in item.options
+    ]
+    return question, options
+
+
+def import_questions(db: Session, exam_id: str, items: Iterable, batch_size: int = IMPORT_BATCH_SIZE) -> list[str]:
+    """Validate and insert questions, their options and exam links ``batch_size`` questions at a time.
+
+    Runs in the caller's transaction; a bad item raises ``QuestionImportError``
+    and the caller rolls back everything written so far.
+    """
+    question_ids = []
+    questions, options = [], []
+
+    def write() -> None:
+        db.execute(insert(Question), questions)
+        db.execute(insert(Option), options)
+        db.execute(insert(ExamQuestion), [{"exam_id": exam_id, "question_id": row["id"]} for row in questions])
+        questions.clear()
+        options.clear()
+
+    try:
+        for index, raw in enumerate(items, start=1):
+            question, question_options = _question_rows(exam_id, index, raw)
+            questions.append(question)
+            options.extend(question_options)
+            question_ids.append(question["id"])
+            if len(questions) >= batch_size:
+                write()
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise QuestionImportError(f"Invalid JSON format: {e}")
+
+    if questions:
+        write()
+    return question_ids
+
+
+def import_text_questions(db: Session, exam_id: str, lines: Iterable[str], batch_size: int = IMPORT_BATCH_SIZE) -> tuple[list[str], list[MCQBlockError]]:
+    """Import the valid blocks of a text MCQ upload and return the invalid ones alongside."""
+    errors = []
+
+    def valid_blocks():
+        for result in iter_text_mcq(lines):
+            if isinstance(result, MCQBlockError):
+                errors.append(result)
+            else:
+                yield result
+
+    return import_questions(db, exam_id, valid_blocks(), batch_size), errors
+
+
+def save_upload(stream: BinaryIO, suffix: str) -> str:
+    """Copy an upload to ``UPLOAD_DIR/imports`` for the import job; returns the path.
+
+    The job may run in another worker process, on another host with the
+    ``"redis"`` job backend, so ``UPLOAD_DIR`` has to be shared storage there.
+    """
+    directory = os.path.join(settings.UPLOAD_DIR, "imports")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4()}{suffix}")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(stream, out, CHUNK_SIZE)
+    return path
+
+
+@job_handler("question_import")
+def run_question_import(ctx: JobContext) -> dict:
+    """Import a saved upload (``format``: json, jsonl or text) in one transaction, then delete the file."""
+    exam_id, path, format = ctx.payload["exam_id"], ctx.payload["path"], ctx.payload["format"]
+    errors = []
+
+    try:
+        with ctx.session_factory() as db, open(path, "rb") as stream:
+            if format == "text":
+                # universal newlines: \r\n, \r and \n all end a line
+                lines = io.TextIOWrapper(stream, encoding="utf-8-sig", newline=None)
+                question_ids, errors = import_text_questions(db, exam_id, lines)
+            else:
+                items = iter_json_lines(stream) if format == "jsonl" else iter_json_array(stream)
+                question_ids = import_questions(db, exam_id, items)
+            db.commit()
+    except UnicodeDecodeError as e:
+        raise QuestionImportError(f"File is not UTF-8: {e}")
+    finally:
+        os.remove(path)
+
+    # a published paper no longer lists every question
+    exam_papers.invalidate(exam_id)
+    return {
+        "exam_id": exam_id,
+        "count": len(question_ids),
+        "errors": [asdict(error) for error in errors],
+    }
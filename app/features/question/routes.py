@@ -4,9 +4,15 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete, insert
 
 
+from app.api.deps.user import get_user
+from app.features.auth.principal import Principal
 from app.infrastructure.database import get_db
 from .schemas import QuestionUploadRequest, QuestionResponse, MCQCreateRequest, ContentBlock, ContentType, OptionCreateSchema, OptionResponseSchema
 from .models import Question, Option
+from .importer import save_upload
+from ..exam.models import Exam
+from ..jobs.queue import jobs
+from ..jobs.schemas import JobResponse
 from ..school.models import Department, Course, Module
 import json
 from uuid import uuid4
@@ -109,52 +115,29 @@ async def create_question(
         raise
 
 
-@question_router.post("/upload")
-async def upload_questions(
+@question_router.post("/upload", response_model=JobResponse, status_code=202)
+def upload_questions(
+    exam_id: str,
     file: UploadFile,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_user),
 ):
-    # Validate file type
-    if not file.filename.endswith(".json"):
-        raise HTTPException(status_code=400, detail="Only JSON files allowed")
-
-    try:
-        content = await file.read()
-        data = json.loads(content.decode("utf-8"))
-
-        # Validate JSON structure
-        validated_data = QuestionUploadRequest(**data)
+    """Queue a question bank import into an exam; poll ``/jobs/{id}`` for the outcome.
 
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON format")
-
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-    created_ids = []
-
-    try:
-        for item in validated_data.questions:
-            question = Question(
-                id=uuid4(),
-                content=item.content,
-                question_type=item.question_type,
-                marks=item.marks,
-                options=[opt.model_dump() for opt in item.options],
-                correct_option=item.correct_option,
-            )
-
-            db.add(question)
-            created_ids.append(question.id)
-
-        db.flush()
-
-    except Exception:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Failed to save questions")
-
-    return {
-        "message": "Questions uploaded successfully",
-        "count": len(created_ids),
-        "question_ids": created_ids
-    }
+    Accepts a ``.json`` array (or ``{"questions": [...]}``) or ``.jsonl`` with
+    one question per line; the file is parsed as it is read and written in
+    batches, all in one transaction.
+    """
+    # Validate file type
+    if file.filename.endswith((".jsonl", ".ndjson")):
+        format, suffix = "jsonl", ".jsonl"
+    elif file.filename.endswith(".json"):
+        format, suffix = "json", ".json"
+    else:
+        raise HTTPException(status_code=400, detail="Only JSON or JSON Lines files allowed")
+
+    if db.get(Exam, exam_id) is None:
+        raise HTTPException(status_code=404, detail="Exam not found")
+
+    path = save_upload(file.file, suffix)
+    return jobs.submit(db, "question_import", {"exam_id": exam_id, "path": path, "format": format}, user_id=user.id)
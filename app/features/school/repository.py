@@ -1,18 +1,29 @@
-
-
 from sqlalchemy.orm import Session 
-from app.core.base_repo import BaseRepository
+from app.core.base_repo import BaseRepository, CachedRepository
+from app.infrastructure.cache_manager import repository_cache
+from ..address.models import Address
 from .models import (
     University,
 )
+from .schemas import UniversityResponse
 from typing import Optional
 
 
 
-class UniversityRepository(BaseRepository[University]):
+class UniversityRepository(CachedRepository, BaseRepository[University]):
+    schema = UniversityResponse
+    tag = "university"
+
     def __init__(self, db:Session):
         super().__init__(University, db)
 
+    def cache_tags(self, id, value):
+        # the response embeds the address
+        tags = super().cache_tags(id, value)
+        if value is not None and value.address_id:
+            tags.append(f"address:{value.address_id}")
+        return tags
+
     def get_by_code(self, code: str) -> Optional[University]:
         return self.db.query(self.model).filter(self.model.code == code).first()
 
@@ -20,3 +31,5 @@ class UniversityRepository(BaseRepository[University]):
         return self.db.query(self.model).filter(self.model.name == name).first()
    
     
+repository_cache.watch(University, lambda row: [f"university:{row.id}"])
+repository_cache.watch(Address, lambda row: [f"address:{row.id}"])
@@ -1,5 +1,5 @@
 from app.features.school.services import FacultyService
-from fastapi import APIRouter, Depends, HTTPException, status 
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status 
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_, and_
 from app.infrastructure.database import get_db
@@ -17,6 +17,7 @@ from .schemas import (
     ProgramCreateRequest,
     ProgramResponse,
     CourseCreateRequest, 
+    CourseResponse,
     DepartmentCreateRequest, 
     DepartmentResponse, 
     FacultyCreateRequest, 
@@ -29,6 +30,7 @@ from .schemas import (
 )
 from .services import UniversityService
 from .repository import UniversityRepository
+from .snapshot import hierarchy
 
 from app.schemas.address import AddressCreateRequest 
 from app.utils.address import create_address
@@ -45,21 +47,27 @@ school_router = APIRouter(
 #     return UniversityService(db)
 
 
-@school_router.get("/universities", response_model=list[UniversityResponse])
-async def get_universities(db: Session = Depends(get_db)):
+def snapshot_response(request: Request, db: Session, name: str) -> Response:
+    """A hierarchy list from the in-memory snapshot; 304 when the client's copy is current."""
+    snapshot = hierarchy.get(db)
+    etag = snapshot.etags[name]
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(snapshot.bodies[name], media_type="application/json", headers=headers)
 
-    # universities = db.query(University).options(
-    #     joinedload(University.address)
-    # # ).all()
-    service = UniversityService(db)
-    universities = service.get_universities()
-   
-    return universities
+
+@school_router.get("/universities", response_model=list[UniversityResponse])
+async def get_universities(request: Request, db: Session = Depends(get_db)):
+    return snapshot_response(request, db, "universities")
 
 @school_router.get("/universities/{uid}", response_model=UniversityResponse)
 async def get_university(uid:str, db: Session = Depends(get_db)):
     service = UniversityService(db)
-    university = service.get_university(uid)
+    university = service.read_university(uid)
 
     return university
 
@@ -131,9 +139,8 @@ async def delete_university(university_id: uuid.UUID, db: Session = Depends(get_
 
     
 @school_router.get("/faculties", response_model=list[FacultyResponse])
-async def get_faculties(db: Session = Depends(get_db)):
-    faculties = db.query(Faculty).all()
-    return faculties
+async def get_faculties(request: Request, db: Session = Depends(get_db)):
+    return snapshot_response(request, db, "faculties")
 
 @school_router.post("/faculties")
 async def create_faculty(data: FacultyCreateRequest, db: Session = Depends(get_db)):
@@ -144,9 +151,8 @@ async def create_faculty(data: FacultyCreateRequest, db: Session = Depends(get_d
 
 
 @school_router.get("/departments", response_model=list[DepartmentResponse])
-async def get_departments(db: Session = Depends(get_db)):
-    departments = db.query(Department).all()
-    return departments
+async def get_departments(request: Request, db: Session = Depends(get_db)):
+    return snapshot_response(request, db, "departments")
 
 
 @school_router.post("/departments", response_model=DepartmentResponse)
@@ -182,22 +188,19 @@ async def create_department(department: DepartmentCreateRequest, db: Session = D
 
 
 @school_router.get("/programs", response_model=list[ProgramResponse])
-async def get_programs(db: Session=Depends(get_db)):
-    programs = db.query(Program).all()
-    return programs
+async def get_programs(request: Request, db: Session=Depends(get_db)):
+    return snapshot_response(request, db, "programs")
 
 
 @school_router.get("/programs/{program_id}", response_model=ProgramResponse)
 async def get_programs(program_id: str, db: Session=Depends(get_db)):
-    try:
-        program = db.query(Program).filter(Program.id==program_id).first()
-        return program 
-
-    except Exception as e:
+    program = hierarchy.get(db).find("programs", "id", program_id)
+    if program is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Program not found!"
         )
+    return program
         
 
 @school_router.post("/programs", response_model=ProgramResponse)
@@ -236,9 +239,8 @@ async def create_program(program: ProgramCreateRequest, db:Session=Depends(get_d
     return new_program
 
 @school_router.get("/modules", response_model=list[ModuleResponse])
-async def get_modules(db: Session = Depends(get_db)):
-    modules = db.query(Module).all()
-    return modules
+async def get_modules(request: Request, db: Session = Depends(get_db)):
+    return snapshot_response(request, db, "modules")
 
 @school_router.post("/modules")
 async def create_module(module: ModuleCreateRequest, db: Session = Depends(get_db)):
@@ -275,10 +277,9 @@ async def create_module(module: ModuleCreateRequest, db: Session = Depends(get_d
 
 
 
-@school_router.get("/courses")
-async def get_courses(db: Session = Depends(get_db)):
-    courses = db.query(Course).all()
-    return courses
+@school_router.get("/courses", response_model=list[CourseResponse])
+async def get_courses(request: Request, db: Session = Depends(get_db)):
+    return snapshot_response(request, db, "courses")
 
 @school_router.post("/courses")
 async def create_course(course: CourseCreateRequest, db: Session = Depends(get_db)):
@@ -14,6 +14,7 @@ from .models import (
 from .schemas import (
     FacultyCreateRequest,
     UniversityCreateRequest,
+    UniversityResponse,
     UniversityUpdateRequest,
 )
 from ..address.schemas import AddressCreateRequest
@@ -37,6 +38,16 @@ class UniversityService:
             )
         return university 
 
+    def read_university(self, university_id: str) -> UniversityResponse:
+        """The university as the API returns it, read through the repository cache."""
+        university = self.repo.get_cached(university_id)
+        if not university:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="University not found"
+            )
+        return university
+
     
     def create_university(self, uni_data: UniversityCreateRequest, address_data: AddressCreateRequest) -> University:
         # Business Logic: Check if name already exists
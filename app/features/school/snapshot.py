@@ -0,0 +1,124 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.logger import logger
+from app.infrastructure.invalidation import invalidations
+from ..address.models import Address
+from .models import Course, Department, Faculty, Module, Program, University
+from .schemas import (
+    CourseResponse,
+    DepartmentResponse,
+    FacultyResponse,
+    ModuleResponse,
+    ProgramResponse,
+    UniversityResponse,
+)
+
+
+_university = (selectinload(University.address),)
+_faculty = (selectinload(Faculty.university).selectinload(University.address),)
+
+# list name -> (model, response schema, eager loads for the nested responses, indexed fields)
+HIERARCHY = {
+    "universities": (University, UniversityResponse, _university, ("id", "code", "name")),
+    "faculties": (Faculty, FacultyResponse, _faculty, ("id", "code", "name")),
+    "departments": (Department, DepartmentResponse, (), ("id", "name")),
+    "programs": (
+        Program, ProgramResponse,
+        (selectinload(Program.faculty).selectinload(Faculty.university).selectinload(University.address),),
+        ("id", "name"),
+    ),
+    "modules": (Module, ModuleResponse, (selectinload(Module.department),), ("id", "title")),
+    "courses": (
+        Course, CourseResponse,
+        (selectinload(Course.module).selectinload(Module.department), selectinload(Course.department)),
+        ("id", "code", "name"),
+    ),
+}
+
+_adapters = {name: TypeAdapter(list[schema]) for name, (_, schema, _, _) in HIERARCHY.items()}
+
+
+@dataclass(frozen=True)
+class HierarchySnapshot:
+    """Every list of the academic hierarchy, validated and serialized once.
+
+    ``bodies`` hold the JSON the list endpoints send and ``etags`` a hash of
+    each, so a list keeps its ETag until its own rows change.
+    """
+    version: int
+    items: dict[str, tuple]
+    bodies: dict[str, bytes]
+    etags: dict[str, str]
+    index: dict[tuple[str, str], dict[str, Any]]  # (list, field) -> value -> item
+
+    def find(self, name: str, field: str, value: str):
+        return self.index[(name, field)].get(str(value))
+
+
+def load_snapshot(db: Session, version: int) -> HierarchySnapshot:
+    items, bodies, etags, index = {}, {}, {}, {}
+    for name, (model, _, options, fields) in HIERARCHY.items():
+        rows = db.scalars(select(model).options(*options).order_by(model.created_at, model.id)).all()
+        validated = _adapters[name].validate_python(rows, from_attributes=True)
+
+        items[name] = tuple(validated)
+        bodies[name] = _adapters[name].dump_json(validated)
+        etags[name] = f'"{hashlib.sha256(bodies[name]).hexdigest()[:32]}"'
+        for field in fields:
+            index[(name, field)] = {str(getattr(item, field)): item for item in validated}
+
+    return HierarchySnapshot(version, items, bodies, etags, index)
+
+
+class HierarchyCache:
+    """The current ``HierarchySnapshot``, rebuilt on the first read after a committed write.
+
+    Writes to any model in the tree bump the version through the
+    invalidation bus; reads in between are served from memory.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._snapshot: HierarchySnapshot | None = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> HierarchySnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version:
+            return snapshot
+
+        with self._lock:
+            # another request may have rebuilt it while this one waited
+            if self._snapshot is None or self._snapshot.version != self.version:
+                self._snapshot = load_snapshot(db, self.version)
+            return self._snapshot
+
+    def load(self, session_factory) -> None:
+        """Build the snapshot at startup, so the first request does not pay for it."""
+        try:
+            with session_factory() as db:
+                self.get(db)
+        except Exception as e:
+            logger.warning(f"Loading the academic hierarchy failed: {e}")
+
+    def invalidate(self) -> None:
+        self.version += 1
+
+
+hierarchy = HierarchyCache()
+
+
+# addresses are embedded in the university responses
+invalidations.watch(
+    (University, Faculty, Department, Program, Module, Course, Address),
+    "hierarchy",
+    lambda row: ["*"],
+)
+invalidations.subscribe("hierarchy", lambda key: hierarchy.invalidate())
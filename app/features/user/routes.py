@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.api.deps.user import get_user, get_current_user
 # from app.core.security import get_current_user
 from app.infrastructure.database import get_db
+from app.middleware.auth_middleware import public
 from .repository import UserRepository
 from .services import UserService
 from .schemas import UserCreate, UserUpdate, UpdatePasswordRequest
@@ -21,6 +22,7 @@ def get_user_service(db: Session = Depends(get_db)):
 
 
 @router.post("/")
+@public
 def create_user(
     user: UserCreate,
     service: UserService = Depends(get_user_service)
@@ -1,10 +1,138 @@
-class CacheManager:
-    def __init__(self, redis_client):
-        self.redis = redis_client
+import functools
+import inspect
+from typing import Any, Callable, Iterable, Optional
 
-    async def get(self, key: str):
-        return await self.redis.get(key)
+from pydantic import TypeAdapter
 
-    async def set(self, key: str, value: str, ttl: int = 300):
-        await self.redis.set(key, value, ex=ttl)
-    
\ No newline at end of file
+from app.core.config import settings
+from app.infrastructure.invalidation import invalidations
+from app.infrastructure.store import StoreCache, build_store
+
+
+class PydanticSerializer:
+    """Schema values as JSON through pydantic-core; a miss round-trips as ``null``.
+
+    Any class with the same three methods can be passed to ``CacheManager``
+    instead, e.g. one writing orjson or msgpack.
+    """
+
+    def __init__(self, schema):
+        self.adapter = TypeAdapter(Optional[schema])
+
+    def validate(self, value):
+        # ORM rows into the schema
+        return self.adapter.validate_python(value, from_attributes=True)
+
+    def dumps(self, value) -> str:
+        return self.adapter.dump_json(value).decode()
+
+    def loads(self, data: str):
+        return self.adapter.validate_json(data)
+
+
+class CacheManager(StoreCache):
+    """Read-through cache for repository reads, kept as serialized schemas.
+
+    Entries carry tags naming the rows they were built from (``program:{id}``);
+    ``watch`` drops every entry under a tag once a change to such a row
+    commits. A miss is cached too, for ``negative_ttl`` seconds.
+    """
+
+    def __init__(self, store, name: str, ttl: int, negative_ttl: int, serializer=PydanticSerializer):
+        super().__init__(store, name)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.serializer = serializer
+        self._serializers: dict[Any, Any] = {}
+        self._topic = f"tags:{name}"
+        invalidations.subscribe(self._topic, self.invalidate_tag)
+
+    def _serializer_for(self, schema):
+        serializer = self._serializers.get(schema)
+        if serializer is None:
+            serializer = self._serializers[schema] = self.serializer(schema)
+        return serializer
+
+    def fetch(
+        self,
+        key: str,
+        schema,
+        load: Callable[[], Any],
+        tags: Callable[[Any], Iterable[str]] | None = None,
+        ttl: int | None = None,
+    ):
+        """``load()`` as ``schema``, read through the cache; concurrent misses share one load."""
+        serializer = self._serializer_for(schema)
+        cached = self.get(key)
+        if cached is not None:
+            return serializer.loads(cached)
+
+        def fill() -> str:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+            invalidations = self._invalidations
+            value = serializer.validate(load())
+            data = serializer.dumps(value)
+            # skip the write if an invalidation landed while loading, it may be stale
+            if invalidations == self._invalidations:
+                entry_ttl = self.negative_ttl if value is None else ttl or self.ttl
+                self.set(key, data, entry_ttl, tuple(tags(value)) if tags else ())
+            return data
+
+        return serializer.loads(self._flight.do(key, fill))
+
+    def cached(self, key: str, schema, tags: Iterable[str] = (), ttl: int | None = None):
+        """Decorate a repository method so its result is read through the cache.
+
+        ``key`` and ``tags`` are ``str.format`` templates over the method's
+        arguments; tags may also read the result, as ``{result.program_id}``,
+        and those are left off a cached miss::
+
+            @repository_cache.cached("university:{id}", UniversityResponse,
+                                     tags=["university:{id}", "address:{result.address_id}"])
+            def get_cached(self, id: str): ...
+        """
+        templates = tuple(tags)
+
+        def decorate(method):
+            signature = inspect.signature(method)
+
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = bound.arguments
+
+                def entry_tags(value) -> list[str]:
+                    formatted = []
+                    for template in templates:
+                        try:
+                            formatted.append(template.format(**arguments, result=value))
+                        except AttributeError:
+                            continue
+                    return formatted
+
+                return self.fetch(key.format(**arguments), schema, lambda: method(*args, **kwargs), entry_tags, ttl)
+            return wrapper
+        return decorate
+
+    def watch(self, model, tags: Callable[[Any], Iterable[str]]) -> None:
+        """Invalidate ``tags(row)`` after a commit that inserts, updates or deletes a ``model`` row."""
+        invalidations.watch(model, self._topic, tags)
+
+
+repository_cache = CacheManager(
+    build_store(
+        settings.REPOSITORY_CACHE_BACKEND,
+        "repo:",
+        settings.REPOSITORY_CACHE_SIZE,
+        dumps=str,
+        loads=str,
+        local_ttl=settings.REPOSITORY_LOCAL_TTL,
+    ),
+    name="Repository",
+    ttl=settings.REPOSITORY_CACHE_TTL,
+    negative_ttl=settings.REPOSITORY_NEGATIVE_TTL,
+)
@@ -1,7 +1,8 @@
-import json
+from pydantic_core import from_json, to_json
 
-def serialize(data):
-    return json.dumps(data)
+
+def serialize(data) -> str:
+    return to_json(data).decode()
 
 def deserialize(data):
-    return json.loads(data)
\ No newline at end of file
+    return from_json(data)
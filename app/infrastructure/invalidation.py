@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class InvalidationBus:
+    """Turns committed row changes into cache invalidations in every worker.
+
+    ``watch(model, topic, keys)`` names the keys under ``topic`` that a
+    changed row affects; ``subscribe(topic, handler)`` drops one of them.
+    Changes are collected after each flush and delivered once the
+    transaction commits, here and, with a Redis client, to every other
+    process over pub/sub; a rollback discards them.
+    """
+
+    def __init__(self, client=None, channel: str = "cache:invalidate"):
+        self.client = client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex  # skips our own messages
+        self._watches: list[tuple[type, str, Callable[[Any], Iterable[str]]]] = []
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._thread: threading.Thread | None = None
+
+    def watch(self, model, topic: str, keys: Callable[[Any], Iterable[str]]) -> None:
+        self._watches.append((model, topic, keys))
+
+    def subscribe(self, topic: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def collect(self, session: Session) -> None:
+        changed = session.info.setdefault("invalidations", set())
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            for model, topic, keys in self._watches:
+                if isinstance(obj, model):
+                    changed.update((topic, key) for key in keys(obj) if key is not None)
+
+    def deliver(self, changes: set[tuple[str, str]]) -> None:
+        if not changes:
+            return
+        self._dispatch(changes)
+        if self.client is not None:
+            try:
+                self.client.publish(self.channel, json.dumps({"origin": self.origin, "changes": sorted(changes)}))
+            except Exception as e:
+                logger.warning(f"Publishing cache invalidations failed: {e}")
+
+    def _dispatch(self, changes: Iterable[tuple[str, str]]) -> None:
+        for topic, key in changes:
+            for handler in self._handlers.get(topic, ()):
+                try:
+                    handler(key)
+                except Exception as e:
+                    logger.warning(f"Invalidating {topic} {key} failed: {e}")
+
+    def start(self) -> None:
+        """With a Redis client, follow the channel for other workers' changes."""
+        if self.client is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._listen, name="invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    data = json.loads(message["data"])
+                    if data["origin"] != self.origin:
+                        self._dispatch(tuple(change) for change in data["changes"])
+            except Exception as e:
+                # entries missed meanwhile still expire with their TTLs
+                logger.warning(f"Invalidation channel lost, resubscribing: {e}")
+                time.sleep(1)
+
+
+def build_invalidation_bus(backend: str) -> InvalidationBus:
+    """``"memory"`` for a single process; ``"redis"`` reaches every worker over pub/sub."""
+    client = None
+    if backend == "redis":
+        from app.infrastructure.redis import sync_redis_client
+        client = sync_redis_client
+    return InvalidationBus(client, settings.INVALIDATION_CHANNEL)
+
+
+invalidations = build_invalidation_bus(settings.INVALIDATION_BACKEND)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    invalidations.collect(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_invalidations(session):
+    invalidations.deliver(session.info.pop("invalidations", set()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("invalidations", None)
@@ -0,0 +1,72 @@
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled",
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit, miss, error)",
+    ["cache", "backend", "result"],
+)
+
+GRADED_ATTEMPTS = Counter(
+    "graded_attempts_total",
+    "Exam attempts graded, by source (submit, regrade)",
+    ["source"],
+)
+
+GRADING_DURATION = Histogram(
+    "grading_duration_seconds",
+    "Time spent in one grading pass (a submission or a regrade chunk)",
+    ["source"],
+)
+
+JOBS_FINISHED = Counter(
+    "jobs_finished_total",
+    "Background jobs finished, by kind and status (COMPLETED, FAILED)",
+    ["kind", "status"],
+)
+
+
+class PoolCollector:
+    """Reads the connection pool counters of the app engines at scrape time."""
+
+    def __init__(self, engines: dict):
+        self.engines = engines  # label -> Engine / AsyncEngine
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["engine"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["engine"])
+        checked_in = GaugeMetricFamily("db_pool_checked_in", "Idle connections in the pool", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections opened beyond pool_size", labels=["engine"])
+
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            # NullPool / StaticPool keep no counters
+            if not hasattr(pool, "checkedout"):
+                continue
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            checked_in.add_metric([name], pool.checkedin())
+            overflow.add_metric([name], pool.overflow())
+
+        yield from (size, checked_out, checked_in, overflow)
+
+
+def register_pool_metrics(engines: dict) -> None:
+    REGISTRY.register(PoolCollector(engines))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
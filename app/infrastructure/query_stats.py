@@ -0,0 +1,75 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request."""
+    count: int = 0
+    total_time: float = 0.0  # seconds
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "X-DB-Query-Count": str(self.count),
+            "X-DB-Time-Ms": f"{self.total_time * 1000:.2f}",
+            "X-DB-Slowest-Ms": f"{self.slowest_time * 1000:.2f}",
+        }
+
+    def __str__(self) -> str:
+        return f"DB: {self.count} queries {self.total_time * 1000:.1f}ms (slowest {self.slowest_time * 1000:.1f}ms)"
+
+
+# the object is shared with the threadpool and SQLAlchemy's greenlets, which copy the context
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+# registered on the Engine class, so every engine is covered: sync, async and the test engines
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(f"Slow query {elapsed * 1000:.1f}ms: {' '.join(statement.split())[:500]}")
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
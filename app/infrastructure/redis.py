@@ -1,7 +1,19 @@
 import redis.asyncio as redis
+from redis import Redis
+
+from app.core.config import settings
 
 redis_client = redis.Redis(
     host="localhost",
     port=6379,
     decode_responses=True
 )
+
+# blocking client for code running in the threadpool (sync routes/services)
+sync_redis_client = Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    password=settings.REDIS_PASSWORD or None,
+    decode_responses=True,
+)
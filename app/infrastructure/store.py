@@ -0,0 +1,322 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.core.logger import logger
+from app.infrastructure.metrics import CACHE_REQUESTS
+
+
+class LRUStore:
+    """Thread-safe in-process LRU; sync routes run on the threadpool."""
+    backend = "memory"
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()  # key -> (value, deadline or None)
+        self._tags: dict[str, set[str]] = {}  # tag -> keys
+        self._key_tags: dict[str, tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _forget(self, key: str) -> None:
+        # caller holds the lock
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+
+            value, deadline = item
+            if deadline is not None and time.monotonic() >= deadline:
+                del self._items[key]
+                self._forget(key)
+                return None
+
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: int | None = None) -> None:
+        if ttl is not None and ttl <= 0:
+            return
+
+        deadline = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._items[key] = (value, deadline)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                evicted, _ = self._items.popitem(last=False)
+                self._forget(evicted)
+
+    def tag(self, key: str, tags: tuple[str, ...], ttl: int | None = None) -> None:
+        with self._lock:
+            if key not in self._items:
+                return
+            self._forget(key)
+            self._key_tags[key] = tuple(tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+            self._forget(key)
+
+    def delete_tag(self, tag: str) -> None:
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._items.pop(key, None)
+                self._forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+
+
+class RedisStore:
+    """Shared store so every worker sees writes and invalidations.
+
+    Keys are found again through sets rather than ``SCAN``, which walks the
+    whole keyspace: a tag set per tag, and a sorted set of every key scored
+    by its deadline, pruned of expired keys on each write, for ``clear``.
+    """
+    backend = "redis"
+
+    def __init__(self, client, prefix: str, dumps: Callable, loads: Callable):
+        self.client = client
+        self.prefix = prefix
+        self.dumps = dumps
+        self.loads = loads
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def get(self, key: str):
+        cached = self.client.get(self._key(key))
+        if not cached:
+            return None
+        return self.loads(cached)
+
+    @property
+    def _index_key(self) -> str:
+        return f"{self.prefix}index:keys"
+
+    def set(self, key: str, value, ttl: int | None = None) -> None:
+        if ttl is not None and ttl <= 0:
+            return
+
+        now = time.time()
+        pipe = self.client.pipeline()
+        if ttl is None:
+            pipe.set(self._key(key), self.dumps(value))
+        else:
+            pipe.setex(self._key(key), ttl, self.dumps(value))
+        pipe.zadd(self._index_key, {key: now + ttl if ttl is not None else float("inf")})
+        pipe.zremrangebyscore(self._index_key, "-inf", now)
+        pipe.execute()
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def tag(self, key: str, tags: tuple[str, ...], ttl: int | None = None) -> None:
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            if ttl is None:
+                pipe.persist(self._tag_key(tag))
+            else:
+                # the set outlives every key it lists
+                pipe.expire(self._tag_key(tag), ttl, nx=True)
+                pipe.expire(self._tag_key(tag), ttl, gt=True)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def delete_tag(self, tag: str) -> None:
+        keys = self.client.smembers(self._tag_key(tag))
+        self.client.delete(self._tag_key(tag), *(self._key(key) for key in keys))
+
+    def clear(self) -> None:
+        keys = self.client.zrange(self._index_key, 0, -1)
+        pipe = self.client.pipeline()
+        for start in range(0, len(keys), 500):
+            pipe.delete(*(self._key(key) for key in keys[start:start + 500]))
+        pipe.delete(self._index_key)
+        pipe.execute()
+
+
+class TieredStore:
+    """An in-process LRU in front of Redis.
+
+    Local entries live for ``local_ttl`` seconds at most, which bounds how
+    long another worker can serve a value this worker has invalidated.
+    """
+    backend = "tiered"
+
+    def __init__(self, local: LRUStore, shared: RedisStore, local_ttl: int):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    def _local_ttl(self, ttl: int | None) -> int:
+        return self.local_ttl if ttl is None else min(ttl, self.local_ttl)
+
+    def get(self, key: str):
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        value = self.shared.get(key)
+        if value is not None:
+            self.local.set(key, value, self.local_ttl)
+        return value
+
+    def set(self, key: str, value, ttl: int | None = None) -> None:
+        self.local.set(key, value, self._local_ttl(ttl))
+        self.shared.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def tag(self, key: str, tags: tuple[str, ...], ttl: int | None = None) -> None:
+        self.local.tag(key, tags, ttl)
+        self.shared.tag(key, tags, ttl)
+
+    def delete_tag(self, tag: str) -> None:
+        self.local.delete_tag(tag)
+        self.shared.delete_tag(tag)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one.
+
+    The first caller runs ``load``; callers arriving before it finishes wait
+    and get its result (or its exception) instead of running ``load`` again.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, tuple[threading.Event, list]] = {}  # key -> (done, [value, error])
+        self._lock = threading.Lock()
+
+    def do(self, key: str, load: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = (threading.Event(), [None, None])
+
+        done, outcome = call
+        if not leader:
+            done.wait()
+            if outcome[1] is not None:
+                raise outcome[1]
+            return outcome[0]
+
+        try:
+            outcome[0] = load()
+            return outcome[0]
+        except Exception as e:
+            outcome[1] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            done.set()
+
+
+class StoreCache:
+    """Front for a store; a store failure is a cache miss, never a request failure."""
+
+    def __init__(self, store, name: str):
+        self.store = store
+        self.name = name
+        self._flight = SingleFlight()
+        self._invalidations = 0
+        self._hits = CACHE_REQUESTS.labels(name, store.backend, "hit")
+        self._misses = CACHE_REQUESTS.labels(name, store.backend, "miss")
+        self._errors = CACHE_REQUESTS.labels(name, store.backend, "error")
+
+    def get(self, key: str):
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"{self.name} lookup failed: {e}")
+            self._errors.inc()
+            return None
+
+        (self._misses if value is None else self._hits).inc()
+        return value
+
+    def set(self, key: str, value, ttl: int | None = None, tags: tuple[str, ...] = ()) -> None:
+        try:
+            self.store.set(key, value, ttl)
+            if tags:
+                self.store.tag(key, tags, ttl)
+        except Exception as e:
+            logger.warning(f"{self.name} store failed: {e}")
+
+    def get_or_load(self, key: str, load: Callable, ttl: int | None = None):
+        """The cached value, or ``load()`` run once per process however many callers miss together.
+
+        ``None`` from ``load`` is returned but not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def fill():
+            # a caller that queued behind the previous load finds it cached
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            invalidations = self._invalidations
+            value = load()
+            # skip the write if an invalidation landed while loading, it may be stale
+            if value is not None and invalidations == self._invalidations:
+                self.set(key, value, ttl)
+            return value
+
+        return self._flight.do(key, fill)
+
+    def invalidate(self, key: str) -> None:
+        self._invalidations += 1
+        try:
+            self.store.delete(key)
+        except Exception as e:
+            logger.warning(f"{self.name} invalidation failed: {e}")
+
+    def invalidate_tag(self, tag: str) -> None:
+        self._invalidations += 1
+        try:
+            self.store.delete_tag(tag)
+        except Exception as e:
+            logger.warning(f"{self.name} invalidation failed: {e}")
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+def build_store(backend: str, prefix: str, maxsize: int, dumps: Callable, loads: Callable, local_ttl: int | None = None):
+    """``"memory"`` or ``"redis"``; with ``local_ttl`` a redis store gets an in-process front."""
+    if backend == "redis":
+        from app.infrastructure.redis import sync_redis_client
+        shared = RedisStore(sync_redis_client, prefix, dumps, loads)
+        if local_ttl:
+            return TieredStore(LRUStore(maxsize), shared, local_ttl)
+        return shared
+    return LRUStore(maxsize)
@@ -1,7 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 # from starlette.middleware.sessions import SessionMiddleware
 
+import asyncio
 from contextlib import asynccontextmanager
 
 # import redis
@@ -10,11 +12,17 @@ import os
 
 
 # import models # critical import to start creating tables at startup
-from app.infrastructure.database import engine
+from app.infrastructure.database import SessionLocal, engine, async_engine
+from app.infrastructure.metrics import register_pool_metrics, render_metrics
 # from app.models import Base
 from app.infrastructure.base import Base 
 from app.core.logger import setup_logging, logger
 from app.core.config import settings
+from app.features.auth.refresh_tokens import purge_expired_refresh_tokens, refresh_tokens
+from app.features.auth.revocation import revocations
+from app.features.jobs.queue import jobs
+from app.infrastructure.invalidation import invalidations
+from app.features.school.snapshot import hierarchy
 
 # from app.api.routes.user import  user_router
 # from app.api.routes.auth import auth_router
@@ -26,8 +34,9 @@ from app.core.config import settings
 
 from app.api.v1.router import v1_router
 
-from app.middleware.auth_middleware import auth_middleware
+from app.middleware.auth_middleware import auth_middleware, build_public_paths
 from app.middleware.logging_middleware import LoggingMiddleware, app_logging_middleware
+from app.middleware.metrics_middleware import metrics_middleware
 
 # In main.py
 from app.web import router as frontend_router
@@ -61,16 +70,36 @@ redis_client = redis.Redis(
 )
 
 
+async def purge_refresh_tokens_periodically():
+    while True:
+        await asyncio.sleep(settings.REFRESH_TOKEN_GC_INTERVAL)
+        try:
+            deleted = await run_in_threadpool(purge_expired_refresh_tokens, SessionLocal, settings.REFRESH_TOKEN_GC_BATCH)
+            if deleted:
+                logger.info(f"Purged {deleted} expired refresh tokens")
+        except Exception:
+            logger.exception("Purging expired refresh tokens failed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Create tables
     logger.info("Starting up FASTAPI SERVER ...")
+    build_public_paths(app)
+    revocations.start(SessionLocal)
+    invalidations.start()
+    await jobs.start()
+    hierarchy.load(SessionLocal)
+    purge_task = asyncio.create_task(purge_refresh_tokens_periodically())
     # Base.metadata.create_all(bind=engine)
     
     yield  # App runs here
     
     # Shutdown: Clean up
     logger.info("Shutting down FASTAPI SERVER...")
+    purge_task.cancel()
+    await jobs.stop()
+    refresh_tokens.close()  # write the refresh tokens still queued
     engine.dispose()
 
 
@@ -97,6 +126,8 @@ app.middleware("http")(auth_middleware)
 
 # ADD LOGGING MIDDLEWARE
 app.middleware("http")(app_logging_middleware)
+app.middleware("http")(metrics_middleware)
+register_pool_metrics({"sync": engine, "async": async_engine})
 # app.middleware(LoggingMiddleware())
 
 # @app.on_event("startup")
@@ -116,6 +147,11 @@ async def health_check():
     
     return payload
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
 @app.get("/redis-test")
 async def redis_test():
     try:
@@ -1,35 +1,104 @@
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.responses import JSONResponse
-from typing import Set
+from fastapi.routing import APIRoute
+from typing import Callable, Iterable
 import re
 
-from app.core.security import verify_token
+from app.core.security import decode_access_token
 
 
-# PUbic endpoints that do not require authentication
-PUBLIC_ENDPOINTS: Set[str] = {
+# PUbic endpoints that do not require authentication, for every method;
+# a trailing "/*" makes the entry a prefix. Routes declare themselves with @public.
+PUBLIC_ENDPOINTS: tuple[str, ...] = (
     "/",
     "/docs",
     "/redoc",
     "/openapi.json",
-    "/users/auth/login",
-    "/users/register",
-    "/public/.*",
-}
+    "/health",
+    "/metrics",
+    "/public/*",
+    "/static/*",
+)
 
+_PATH_PARAM = re.compile(r"\{([^}:]+)(?::(\w+))?\}")
 
-def is_public_path(path: str) -> bool:
+
+def public(endpoint: Callable) -> Callable:
+    """Mark a route as public; put it below the router decorator."""
+    endpoint.__public__ = True
+    return endpoint
+
+
+def _path_regex(path: str) -> str:
+    if path.endswith("/*"):
+        return re.escape(path[:-1]) + ".*"
+
+    regex, position = [], 0
+    for param in _PATH_PARAM.finditer(path):
+        regex.append(re.escape(path[position:param.start()]))
+        regex.append(".+" if param.group(2) == "path" else "[^/]+")
+        position = param.end()
+    regex.append(re.escape(path[position:]))
+    return "".join(regex)
+
+
+def _compile(patterns: Iterable[str]) -> re.Pattern:
+    patterns = sorted(set(patterns))
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("(?:" + "|".join(patterns) + r")\Z")
+
+
+class PublicPathMatcher:
+    """Public paths compiled once into a single anchored pattern per HTTP method."""
+
+    def __init__(self, paths: Iterable[str], routes: Iterable[tuple[str, str]] = ()):
+        common = [_path_regex(path) for path in paths]
+        by_method: dict[str, list[str]] = {}
+        for method, path in routes:
+            by_method.setdefault(method, []).append(_path_regex(path))
+
+        self._any = _compile(common)
+        self._methods = {method: _compile(common + patterns) for method, patterns in by_method.items()}
+
+    @classmethod
+    def from_app(cls, app: FastAPI, paths: Iterable[str] = PUBLIC_ENDPOINTS) -> "PublicPathMatcher":
+        routes = []
+        for route in app.routes:
+            if isinstance(route, APIRoute) and getattr(route.endpoint, "__public__", False):
+                methods = set(route.methods)
+                if "GET" in methods:
+                    methods.add("HEAD")
+                routes += [(method, route.path) for method in methods]
+        return cls(paths, routes)
+
+    def match(self, method: str, path: str) -> bool:
+        return self._methods.get(method, self._any).match(path) is not None
+
+
+public_paths: PublicPathMatcher | None = None
+
+
+def build_public_paths(app: FastAPI) -> PublicPathMatcher:
+    """Compile the public paths of ``app``; call once the routes are registered."""
+    global public_paths
+    public_paths = PublicPathMatcher.from_app(app)
+    return public_paths
+
+
+def is_public_path(path: str, method: str = "GET") -> bool:
     """Check if the requested path is public."""
-    for pattern in PUBLIC_ENDPOINTS:
-        if re.match(pattern, path):
-            return True
-    return False
+    if public_paths is None:
+        return PublicPathMatcher(PUBLIC_ENDPOINTS).match(method, path)
+    return public_paths.match(method, path)
 
 
 async def auth_middleware(request: Request, call_next):
 
+    matcher = public_paths or build_public_paths(request.app)
+
     # Skip authentication for public routes
-    if is_public_path(request.url.path):
+    if matcher.match(request.method, request.scope["path"]):
         return await call_next(request)
     
     # Get token from header
@@ -45,10 +114,11 @@ async def auth_middleware(request: Request, call_next):
     token = auth_header.replace("Bearer ", "")
 
     try:
-        # Verify token
-        user_id = verify_token(token)
+        # Verify token; dependencies reuse the decoded claims
+        claims = decode_access_token(token)
         # Attache user info to request state
-        request.state.user_id = user_id
+        request.state.token_claims = claims
+        request.state.user_id = claims["sub"]
         request.state.is_authenticated = True
 
     except Exception as e:
@@ -5,7 +5,9 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
 import uuid
+from app.core.config import settings
 from app.core.logger import logger
+from app.infrastructure.query_stats import start_query_stats
 
 LOG_FORMAT_DEBUG="%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
 
@@ -72,6 +74,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 async def app_logging_middleware(request: Request, call_next):
     request_id = str(uuid.uuid4())
     start_time = time.time()
+    query_stats = start_query_stats()
 
     # log_dict = {
     #         'url': request.url.path,
@@ -86,7 +89,8 @@ async def app_logging_middleware(request: Request, call_next):
     except Exception as exc:
         logger.exception(
             f"RID: {request_id} | "
-            f"Error processing request {request.method} {request.url.path}"
+            f"Error processing request {request.method} {request.url.path} | "
+            f"{query_stats}"
         )
         raise exc
 
@@ -97,9 +101,12 @@ async def app_logging_middleware(request: Request, call_next):
         f"{request.client.host}:{request.client.port} | "
         f"{request.method} {request.url.path} | "
         f"Status: {response.status_code} | "
-        f"{process_time:.4f}s"
+        f"{process_time:.4f}s | "
+        f"{query_stats}"
     )
 
     response.headers["X-Request-ID"] = request_id
+    if settings.QUERY_STATS_HEADERS:
+        response.headers.update(query_stats.headers())
 
     return response
\ No newline at end of file
@@ -0,0 +1,24 @@
+import time
+
+from fastapi import Request
+
+from app.infrastructure.metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+
+
+async def metrics_middleware(request: Request, call_next):
+    REQUESTS_IN_PROGRESS.inc()
+    start_time = time.perf_counter()
+    status_code = 500
+
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+
+    finally:
+        REQUESTS_IN_PROGRESS.dec()
+
+        # label by route template, not the raw path, so ids do not explode the series count
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUEST_LATENCY.labels(request.method, path, str(status_code)).observe(time.perf_counter() - start_time)
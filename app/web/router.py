@@ -7,6 +7,8 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from typing import Optional
 
+from app.middleware.auth_middleware import public
+
 # Get the directory
 FRONTEND_DIR = Path(__file__).parent
 
@@ -52,19 +54,23 @@ async def render(request: Request, template_name: str, extra_context: dict = Non
     return templates.TemplateResponse(template_name, context)
 
 @router.get("/", response_class=HTMLResponse, name="home")
+@public
 async def home(request: Request):
     messages = get_flashed_messages(request)
     return await render(request, "home.html", {"messages": messages})
 
 @router.get("/about", response_class=HTMLResponse, name="about")
+@public
 async def about(request: Request):
     return await render(request, "about.html", {"page_title": "About Us"})
 
 @router.get("/contact", response_class=HTMLResponse, name="contact")
+@public
 async def contact(request: Request):
     return await render(request, "contact.html", {"page_title": "Contact Us"})
 
 @router.post("/subscribe", name="subscribe")
+@public
 async def subscribe(request: Request):
     """AJAX endpoint for newsletter subscription"""
     try:
@@ -82,6 +88,7 @@ async def subscribe(request: Request):
         return {"success": False, "message": str(e)}
 
 @router.get("/health")
+@public
 async def health_check():
     return {"status": "healthy", "service": "frontend"}
 
@@ -3,11 +3,12 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 import app 
 from app.main import app
-from app.infrastructure.database import get_db
+from app.infrastructure.database import get_async_db, get_db
 from app.infrastructure.base import Base
 from app.features.user.models import User
 from app.core.security import create_access_token, hash_password
@@ -21,6 +22,10 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# same file for the async routes; every TestClient runs its own event loop, so no pooling
+async_engine = create_async_engine("sqlite+aiosqlite:///./_test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 TEST_USERNAME = "testuser"
 TEST_EMAIL = "test@example.com"
 TEST_PASSWORD = "TestPassword#123"
@@ -48,7 +53,17 @@ def client(db):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except:
+                await session.rollback()
+                raise
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -80,4 +95,15 @@ def authorized_client(client, test_user_token):
         **client.headers,
         "Authorization": f"Bearer {test_user_token}"
     }
-    return client
\ No newline at end of file
+    return client
+
+def wait_for_job(client, job_id: str, timeout: float = 10.0, headers: dict | None = None) -> dict:
+    """Poll ``/jobs/{id}`` until the background job has finished."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("COMPLETED", "FAILED") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
@@ -0,0 +1,87 @@
+# tests/exam/conftest.py
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.features.auth.models import Permission, PermissionName, Role, RoleName, RolePermission, UserRole
+from app.features.exam.models import Exam, ExamQuestion, ExamTypeEnum
+from app.features.question.models import Question, Option
+from app.features.user.models import User
+
+
+QUESTION_COUNT = 3
+
+
+@pytest.fixture(scope="function")
+def exam(db):
+    """Create a visible exam with QUESTION_COUNT questions; option 'A' is always correct."""
+    now = datetime.now(timezone.utc)
+    model = Exam(
+        title="Model Exit Exam",
+        program_id="program-1",
+        maximum_marks=QUESTION_COUNT,
+        duration=timedelta(minutes=60),
+        duration_minutes=60,
+        exam_type=ExamTypeEnum.MODEL_EXIT_EXAM,
+        is_visible=True,
+        start_time=now - timedelta(minutes=5),
+        end_time=now + timedelta(hours=2),
+    )
+    db.add(model)
+    db.flush()
+
+    for index in range(QUESTION_COUNT):
+        question = Question(
+            exam_id=model.id,
+            content=[{"type": "text", "value": f"Question {index + 1}"}],
+            marks=1,
+        )
+        question.options = [
+            Option(label=label, content=[{"type": "text", "value": label}], is_correct=label == "A")
+            for label in "ABCD"
+        ]
+        db.add(question)
+        db.flush()
+        db.add(ExamQuestion(exam_id=model.id, question_id=question.id))
+
+    db.commit()
+    db.refresh(model)
+    return model
+
+
+@pytest.fixture(scope="function")
+def student_client(client, test_user):
+    """Test client authenticated as the test user."""
+    token = create_access_token(data={"sub": str(test_user.id)})["token"]
+    client.headers.update({"Authorization": f"Bearer {token}"})
+    return client
+
+
+@pytest.fixture(scope="function")
+def query_stats_headers(monkeypatch):
+    """Send the X-DB-* headers, which are off by default."""
+    monkeypatch.setattr(settings, "QUERY_STATS_HEADERS", True)
+
+
+@pytest.fixture(scope="function")
+def staff_headers(db):
+    """Auth headers of an editor allowed to create exams and generate reports."""
+    user = User(username="staff", email="staff@example.com", hashed_password="-", is_active=True)
+    role = Role(name=RoleName.EDITOR, description="Editor")
+    permissions = [
+        Permission(name=name, description=name.value)
+        for name in (PermissionName.CREATE_EXAM, PermissionName.GENERATE_REPORT)
+    ]
+    db.add_all([user, role, *permissions])
+    db.flush()
+    db.add_all([RolePermission(role_id=role.id, permission_id=permission.id) for permission in permissions])
+    db.add(UserRole(user_id=user.id, role_id=role.id, assigned_by=user.id))
+    db.commit()
+
+    token = create_access_token(data={"sub": str(user.id)})["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def option_id(db, question_id: str, label: str) -> str:
+    return db.query(Option).filter(Option.question_id == question_id, Option.label == label).one().id
@@ -0,0 +1,348 @@
+# tests/exam/test_exam_attempts.py
+import csv
+import io
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+
+from app.features.exam.cache import exams
+from app.features.exam.models import Exam, ExamQuestion, ExamTypeEnum, UserAnswer
+from app.features.exam.schemas import ExamResponse
+from tests.conftest import wait_for_job
+from tests.exam.conftest import QUESTION_COUNT, option_id
+
+
+def start_attempt(client, exam):
+    response = client.post(f"/api/v1/exams/{exam.id}/start")
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["id"]
+
+
+def exam_question_ids(db, exam):
+    return [eq.question_id for eq in db.query(ExamQuestion).filter(ExamQuestion.exam_id == exam.id)]
+
+
+def test_start_attempt_is_idempotent(student_client, exam):
+    first = start_attempt(student_client, exam)
+    second = start_attempt(student_client, exam)
+
+    assert first == second
+
+
+def test_questions_hide_correct_option(student_client, exam):
+    attempt_id = start_attempt(student_client, exam)
+
+    response = student_client.get(f"/api/v1/exams/attempts/{attempt_id}/questions")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data) == QUESTION_COUNT
+    assert all("is_correct" not in option for q in data for option in q["options"])
+
+
+def test_batch_answers_upsert(student_client, db, exam):
+    attempt_id = start_attempt(student_client, exam)
+    question_ids = exam_question_ids(db, exam)
+
+    answers = [{"question_id": qid, "selected_option": option_id(db, qid, "B")} for qid in question_ids]
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["saved"] == QUESTION_COUNT
+
+    # re-answering overwrites instead of duplicating rows
+    answers = [{"question_id": question_ids[0], "selected_option": option_id(db, question_ids[0], "A")}]
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    assert response.status_code == status.HTTP_200_OK
+
+    rows = db.query(UserAnswer).filter(UserAnswer.attempt_id == attempt_id).all()
+    assert len(rows) == QUESTION_COUNT
+    selected = {row.question_id: row.selected_option_id for row in rows}
+    assert selected[question_ids[0]] == option_id(db, question_ids[0], "A")
+
+
+def test_batch_answers_reject_foreign_option(student_client, db, exam):
+    attempt_id = start_attempt(student_client, exam)
+    first, second = exam_question_ids(db, exam)[:2]
+
+    answers = [{"question_id": first, "selected_option": option_id(db, second, "A")}]
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert db.query(UserAnswer).filter(UserAnswer.attempt_id == attempt_id).count() == 0
+
+
+def test_submit_scores_attempt(student_client, db, exam):
+    attempt_id = start_attempt(student_client, exam)
+    first, second, _ = exam_question_ids(db, exam)
+
+    answers = [
+        {"question_id": first, "selected_option": option_id(db, first, "A")},
+        {"question_id": second, "selected_option": option_id(db, second, "C")},
+    ]
+    student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/submit")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["score"] == 1
+
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/submit")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_answers_skip_attempt_lookups(student_client, db, exam):
+    from sqlalchemy import event
+    from tests.conftest import async_engine
+
+    attempt_id = start_attempt(student_client, exam)
+    qid = exam_question_ids(db, exam)[0]
+    answers = [{"question_id": qid, "selected_option": option_id(db, qid, "A")}]
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == status.HTTP_200_OK
+    lookups = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert lookups == []
+
+
+def test_submit_invalidates_attempt_session(student_client, db, exam):
+    attempt_id = start_attempt(student_client, exam)
+    qid = exam_question_ids(db, exam)[0]
+
+    student_client.post(f"/api/v1/exams/attempts/{attempt_id}/submit")
+
+    answers = [{"question_id": qid, "selected_option": option_id(db, qid, "A")}]
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Exam already submitted"
+
+
+def test_completed_attempt_rejects_answers_despite_cached_session(student_client, db, exam):
+    from sqlalchemy import update
+    from app.features.exam.models import ExamAttempt
+
+    attempt_id = start_attempt(student_client, exam)
+    qid = exam_question_ids(db, exam)[0]
+    answers = [{"question_id": qid, "selected_option": option_id(db, qid, "A")}]
+    assert student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers}).status_code == 200
+
+    # completed by another worker: this one's session cache never heard of it
+    db.execute(update(ExamAttempt).where(ExamAttempt.id == attempt_id).values(is_completed=True))
+    db.commit()
+
+    answers = [{"question_id": qid, "selected_option": option_id(db, qid, "B")}]
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert db.query(UserAnswer).filter(UserAnswer.attempt_id == attempt_id).one().selected_option_id == option_id(db, qid, "A")
+
+
+def test_regrade_after_answer_key_correction(student_client, db, exam, staff_headers):
+    from app.features.exam.models import ExamAttempt
+    from app.features.question.models import Option
+
+    attempt_id = start_attempt(student_client, exam)
+    first, second, _ = exam_question_ids(db, exam)
+    answers = [
+        {"question_id": first, "selected_option": option_id(db, first, "A")},
+        {"question_id": second, "selected_option": option_id(db, second, "C")},
+    ]
+    student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    student_client.post(f"/api/v1/exams/attempts/{attempt_id}/submit")
+
+    # the key for the second question was wrong: C is the right answer
+    for option in db.query(Option).filter(Option.question_id == second):
+        option.is_correct = option.label == "C"
+    db.commit()
+
+    # a student may not rewrite everyone's scores
+    response = student_client.post(f"/api/v1/exams/{exam.id}/regrade")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = student_client.post(f"/api/v1/exams/{exam.id}/regrade", headers=staff_headers)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    job = wait_for_job(student_client, response.json()["id"], headers=staff_headers)
+    assert job["status"] == "COMPLETED"
+    assert job["processed"] == job["total"] == 1
+
+    db.expire_all()
+    assert db.get(ExamAttempt, attempt_id).score == 2
+    rows = db.query(UserAnswer).filter(UserAnswer.attempt_id == attempt_id).all()
+    assert len(rows) == QUESTION_COUNT
+    # blank answers get their ids in SQL, in the same form as str(uuid4())
+    assert all(str(uuid.UUID(row.id)) == row.id for row in rows)
+
+
+def test_publishing_caches_exam_paper(student_client, exam):
+    from app.features.exam.cache import exam_papers
+
+    response = student_client.put(f"/api/v1/exams/{exam.id}/visibility", params={"visible": True})
+    assert response.status_code == status.HTTP_200_OK
+    paper = exam_papers.get(exam.id)
+    assert paper is not None
+
+    attempt_id = start_attempt(student_client, exam)
+    response = student_client.get(f"/api/v1/exams/attempts/{attempt_id}/questions")
+    assert {q["id"] for q in response.json()} == set(paper.order)
+    assert b"is_correct" not in response.content
+
+    student_client.put(f"/api/v1/exams/{exam.id}/visibility", params={"visible": False})
+    assert exam_papers.get(exam.id) is None
+
+
+def test_attempt_order_is_shuffled_per_attempt(student_client, db, exam):
+    from app.features.exam.models import AttemptQuestion
+
+    attempt_id = start_attempt(student_client, exam)
+    rows = (
+        db.query(AttemptQuestion)
+        .filter(AttemptQuestion.attempt_id == attempt_id)
+        .order_by(AttemptQuestion.order_index)
+        .all()
+    )
+    assert sorted(row.question_id for row in rows) == sorted(exam_question_ids(db, exam))
+
+    first = student_client.get(f"/api/v1/exams/attempts/{attempt_id}/questions").json()
+    second = student_client.get(f"/api/v1/exams/attempts/{attempt_id}/questions").json()
+
+    # served in the materialized order, with the same option order on every load
+    assert [q["id"] for q in first] == [row.question_id for row in rows]
+    assert first == second
+    assert all(sorted(o["label"] for o in q["options"]) == ["A", "B", "C", "D"] for q in first)
+
+
+def test_query_stats_headers(student_client, db, exam, query_stats_headers):
+    attempt_id = start_attempt(student_client, exam)
+    qid = exam_question_ids(db, exam)[0]
+    answers = [{"question_id": qid, "selected_option": option_id(db, qid, "A")}]
+
+    response = student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+
+    # only the upsert: the user and the attempt checks come from the principal and session caches
+    assert response.headers["X-DB-Query-Count"] == "1"
+    assert float(response.headers["X-DB-Time-Ms"]) >= float(response.headers["X-DB-Slowest-Ms"])
+
+
+def test_user_change_invalidates_cached_principal(student_client, db, exam, test_user):
+    attempt_id = start_attempt(student_client, exam)
+    response = student_client.get(f"/api/v1/exams/attempts/{attempt_id}/questions")
+    assert response.status_code == status.HTTP_200_OK
+
+    test_user.is_active = False
+    db.commit()
+
+    response = student_client.get(f"/api/v1/exams/attempts/{attempt_id}/questions")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_results_export_streams_csv(student_client, db, exam, test_user, staff_headers):
+    attempt_id = start_attempt(student_client, exam)
+    question_ids = [
+        row.question_id
+        for row in db.query(ExamQuestion).filter(ExamQuestion.exam_id == exam.id).order_by(ExamQuestion.id)
+    ]
+    answers = [
+        {"question_id": question_ids[0], "selected_option": option_id(db, question_ids[0], "A")},
+        {"question_id": question_ids[1], "selected_option": option_id(db, question_ids[1], "B")},
+    ]
+    student_client.post(f"/api/v1/exams/attempts/{attempt_id}/answers", json={"answers": answers})
+    student_client.post(f"/api/v1/exams/attempts/{attempt_id}/submit")
+
+    response = student_client.get(f"/api/v1/exams/{exam.id}/results/export", headers=staff_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+
+    header, row = list(csv.reader(io.StringIO(response.text)))
+    assert header[-QUESTION_COUNT:] == [f"Q{index}" for index in range(1, QUESTION_COUNT + 1)]
+    assert row[header.index("attempt_id")] == attempt_id
+    assert row[header.index("username")] == test_user.username
+    assert float(row[header.index("score")]) == 1
+    assert row[-QUESTION_COUNT:] == ["1", "0", ""]
+
+    response = student_client.get(f"/api/v1/exams/{exam.id}/results/export", params={"format": "xlsx"}, headers=staff_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content.startswith(b"PK")
+
+
+def test_students_cannot_export_results(student_client, exam):
+    response = student_client.get(f"/api/v1/exams/{exam.id}/results/export")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_exam_metadata_is_cached_until_changed(student_client, db, exam, query_stats_headers):
+    response = student_client.get(f"/api/v1/exams/{exam.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["is_visible"] is True
+
+    response = student_client.get(f"/api/v1/exams/{exam.id}")
+    assert response.headers["X-DB-Query-Count"] == "0"
+
+    student_client.put(f"/api/v1/exams/{exam.id}/visibility", params={"visible": False})
+    db.commit()  # get_db commits on exit; the test override leaves it to the test
+    response = student_client.get(f"/api/v1/exams/{exam.id}")
+    assert response.json()["is_visible"] is False
+
+
+def test_concurrent_exam_misses_read_once(db, exam):
+    loads = []
+    release = threading.Event()
+
+    def load():
+        loads.append(1)
+        release.wait(5)
+        return ExamResponse.model_validate(exam)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        futures = [pool.submit(exams.get_or_load, exam.id, load) for _ in range(20)]
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(loads) == 1
+    assert all(result.id == exam.id for result in results)
+
+
+def test_exam_list_pages_by_cursor(student_client, db, exam):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for index in range(4):
+        db.add(Exam(
+            title=f"Exam {index}", program_id="program-2", duration=timedelta(minutes=30),
+            duration_minutes=30, exam_type=ExamTypeEnum.MODEL_EXIT_EXAM, is_visible=index % 2 == 0,
+            end_time=now, created_at=now - timedelta(minutes=index),
+        ))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "program_id": "program-2", **({"cursor": cursor} if cursor else {})}
+        page = student_client.get("/api/v1/exams/all", params=params).json()
+        seen += [item["title"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["Exam 0", "Exam 1", "Exam 2", "Exam 3"]
+
+    page = student_client.get("/api/v1/exams/all", params={"program_id": "program-2", "is_visible": True, "order": "asc"}).json()
+    assert [item["title"] for item in page["items"]] == ["Exam 2", "Exam 0"]
+
+    response = student_client.get("/api/v1/exams/all", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = student_client.get("/api/v1/exams/all", params={"limit": 1000})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    attempt_id = start_attempt(student_client, exam)
+    page = student_client.get(f"/api/v1/exams/{exam.id}/attempts", params={"status": "IN_PROGRESS"}).json()
+    assert [item["id"] for item in page["items"]] == [attempt_id]
+    assert page["next_cursor"] is None
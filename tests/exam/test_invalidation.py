@@ -0,0 +1,74 @@
+# tests/exam/test_invalidation.py
+import json
+
+from app.features.exam.cache import exams
+from app.features.exam.schemas import ExamResponse
+from app.infrastructure.invalidation import InvalidationBus
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+def test_only_committed_changes_invalidate(db, exam):
+    exams.set(exam.id, ExamResponse.model_validate(exam))
+
+    exam.title = "Renamed"
+    db.flush()
+    db.rollback()
+    assert exams.get(exam.id) is not None
+
+    exam.title = "Renamed"
+    db.commit()
+    assert exams.get(exam.id) is None
+
+
+def test_bus_publishes_to_other_workers():
+    client = RecordingRedis()
+    bus = InvalidationBus(client, "cache:invalidate")
+    dropped = []
+    bus.subscribe("exam", dropped.append)
+
+    bus.deliver({("exam", "exam-1")})
+
+    assert dropped == ["exam-1"]
+    channel, message = client.published[0]
+    assert channel == "cache:invalidate"
+    assert message["origin"] == bus.origin
+    assert message["changes"] == [["exam", "exam-1"]]
+
+
+def test_moving_questions_and_options_drops_both_papers(db, exam):
+    from app.features.exam.cache import ExamPaper, exam_papers
+    from app.features.exam.models import Exam
+    from app.features.question.models import Option, Question
+
+    other = Exam(
+        title="Other", program_id="program-1", maximum_marks=1, duration=exam.duration,
+        duration_minutes=60, exam_type=exam.exam_type, end_time=exam.end_time,
+    )
+    db.add(other)
+    db.flush()
+    target = Question(exam_id=other.id, content=[], marks=1)
+    db.add(target)
+    db.commit()
+
+    def cache_papers():
+        for exam_id in (exam.id, other.id):
+            exam_papers.set(exam_id, ExamPaper(order=(), questions={}))
+
+    question = db.query(Question).filter(Question.exam_id == exam.id).first()
+    cache_papers()
+    question.exam_id = other.id
+    db.commit()
+    assert exam_papers.get(exam.id) is None and exam_papers.get(other.id) is None
+
+    option = db.query(Option).join(Question).filter(Question.exam_id == exam.id).first()
+    cache_papers()
+    option.question_id = target.id
+    db.commit()
+    assert exam_papers.get(exam.id) is None and exam_papers.get(other.id) is None
@@ -0,0 +1,89 @@
+# tests/exam/test_question_upload.py
+import json
+
+from fastapi import status
+
+from app.features.exam.models import ExamQuestion
+from app.features.question.models import Option, Question
+from tests.conftest import wait_for_job
+from tests.exam.conftest import QUESTION_COUNT
+
+
+def bank(count):
+    return [
+        {
+            "content": f"Uploaded {index}",
+            "question_type": "mcq",
+            "marks": 1,
+            "options": [{"key": key, "text": f"Option {key}"} for key in "ABCD"],
+            "correct_option": "C",
+        }
+        for index in range(count)
+    ]
+
+
+def upload(client, exam, filename, body):
+    response = client.post(f"/api/v1/questions/upload?exam_id={exam.id}", files={"file": (filename, body)})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    return wait_for_job(client, response.json()["id"])
+
+
+def exam_question_count(db, exam):
+    return db.query(ExamQuestion).filter(ExamQuestion.exam_id == exam.id).count()
+
+
+def test_upload_json_array_and_lines(student_client, db, exam):
+    job = upload(student_client, exam, "bank.json", json.dumps({"questions": bank(5)}))
+    assert job["status"] == "COMPLETED"
+    assert job["result"]["count"] == 5
+
+    lines = "\n".join(json.dumps(item) for item in bank(4))
+    job = upload(student_client, exam, "bank.jsonl", lines)
+    assert job["result"]["count"] == 4
+
+    assert exam_question_count(db, exam) == QUESTION_COUNT + 9
+    question = db.query(Question).filter(Question.content == [{"type": "text", "value": "Uploaded 0"}]).first()
+    correct = db.query(Option).filter(Option.question_id == question.id, Option.is_correct == True).one()
+    assert correct.label == "C"
+
+
+def test_upload_rejects_bad_item_without_writing(student_client, db, exam):
+    items = bank(3)
+    items[2]["correct_option"] = "E"
+
+    job = upload(student_client, exam, "bank.json", json.dumps(items))
+    assert job["status"] == "FAILED"
+    assert job["error"].startswith("Question 3:")
+    assert exam_question_count(db, exam) == QUESTION_COUNT
+
+
+def test_upload_text_keeps_valid_blocks_and_reports_bad_ones(student_client, db, exam):
+    text = (
+        "1. Which layer routes packets?\r\nA) Link\r\nB) Network\r\nC) Session\r\nD) Physical\r\nE) Transport\r\nANSWER: B\r\n\r\n"
+        "2) Missing answer\nA) yes\nB) no\n\n"
+        "3: Last one\nA. left\nB. right\nAnswer: a\n"
+    )
+    response = student_client.post(f"/api/v1/exams/{exam.id}/upload-questions", files={"file": ("bank.txt", text)})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    job = wait_for_job(student_client, response.json()["id"])
+    assert job["status"] == "COMPLETED"
+    assert job["result"]["count"] == 2
+    assert job["result"]["errors"] == [{"block": 2, "line": 9, "message": "Missing ANSWER line"}]
+    assert exam_question_count(db, exam) == QUESTION_COUNT + 2
+
+
+def test_jobs_are_visible_to_their_creator_and_staff(student_client, db, exam, staff_headers):
+    from app.core.security import create_access_token
+    from app.features.user.models import User
+
+    job = upload(student_client, exam, "bank.json", json.dumps(bank(1)))
+    assert job["status"] == "COMPLETED"
+    assert student_client.get(f"/api/v1/jobs/{job['id']}", headers=staff_headers).status_code == status.HTTP_200_OK
+
+    other = User(username="other", email="other@example.com", hashed_password="-", is_active=True)
+    db.add(other)
+    db.commit()
+    token = create_access_token(data={"sub": str(other.id)})["token"]
+    response = student_client.get(f"/api/v1/jobs/{job['id']}", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,26 @@
+# tests/test_jobs.py
+from datetime import datetime, timedelta, timezone
+
+from app.features.jobs.models import Job, JobStatus
+from app.features.jobs.queue import JobQueue
+from tests.conftest import TestingSessionLocal
+
+
+def test_stale_running_jobs_are_requeued(db):
+    now = datetime.now(timezone.utc)
+    for id, heartbeat_at, started_at in (
+        ("dead", now - timedelta(hours=1), now - timedelta(hours=2)),
+        ("alive", now - timedelta(seconds=5), now - timedelta(hours=2)),
+        ("before-heartbeats", None, now - timedelta(hours=2)),
+    ):
+        db.add(Job(id=id, kind="question_import", payload={}, status=JobStatus.RUNNING, processed=3,
+                   created_at=started_at, started_at=started_at, heartbeat_at=heartbeat_at))
+    db.commit()
+
+    queue = JobQueue(workers=1, session_factory=TestingSessionLocal)
+    assert sorted(queue._reclaim_stale_jobs()) == ["before-heartbeats", "dead"]
+    assert sorted(queue._pending_job_ids()) == ["before-heartbeats", "dead"]
+
+    db.expire_all()
+    assert db.get(Job, "alive").status == JobStatus.RUNNING
+    assert db.get(Job, "dead").started_at is None
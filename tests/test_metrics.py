@@ -0,0 +1,15 @@
+# tests/test_metrics.py
+from fastapi import status
+
+
+def test_metrics_exposes_route_latency_and_pool(client):
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert "http_requests_in_progress" in body
+    assert 'db_pool_checked_out{engine="sync"}' in body
@@ -0,0 +1,32 @@
+# tests/test_password_hashing.py
+import hashlib
+
+from fastapi import status
+
+from app.core.security import hash_password, verify_password
+from tests.conftest import TEST_PASSWORD, TEST_USERNAME
+
+
+def test_hash_password_uses_argon2():
+    hashed = hash_password(TEST_PASSWORD)
+
+    assert hashed.startswith("$argon2id$")
+    assert verify_password(TEST_PASSWORD, hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_login_rehashes_legacy_sha256(client, db, test_user):
+    test_user.hashed_password = hashlib.sha256(TEST_PASSWORD.encode()).hexdigest()
+    db.commit()
+
+    response = client.post("/api/v1/auth/token", data={"username": TEST_USERNAME, "password": TEST_PASSWORD})
+    assert response.status_code == status.HTTP_200_OK
+
+    db.refresh(test_user)
+    assert test_user.hashed_password.startswith("$argon2id$")
+    assert verify_password(TEST_PASSWORD, test_user.hashed_password)
+
+
+def test_login_rejects_wrong_password(client, test_user):
+    response = client.post("/api/v1/auth/token", data={"username": TEST_USERNAME, "password": "wrong"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
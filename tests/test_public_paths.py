@@ -0,0 +1,24 @@
+# tests/test_public_paths.py
+from fastapi import status
+
+from app.middleware.auth_middleware import PublicPathMatcher
+
+
+def test_matcher_is_anchored_and_method_aware():
+    matcher = PublicPathMatcher(["/", "/static/*"], [("POST", "/api/v1/users/"), ("GET", "/files/{name}")])
+
+    assert matcher.match("GET", "/")
+    assert not matcher.match("GET", "/api/v1/exams/all")
+    assert matcher.match("GET", "/static/css/site.css")
+    assert matcher.match("POST", "/api/v1/users/")
+    assert not matcher.match("PUT", "/api/v1/users/")
+    assert matcher.match("GET", "/files/report.pdf")
+    assert not matcher.match("GET", "/files/a/b")
+
+
+def test_public_route_skips_authentication(client):
+    response = client.post("/api/v1/auth/login", data={"username": "nobody", "password": "secret"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.put("/api/v1/users/", json={})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,30 @@
+# tests/test_rbac.py
+import pytest
+from fastapi import HTTPException
+
+from app.features.auth.models import Permission, PermissionName, Role, RoleName, RolePermission, UserRole
+from app.features.auth.principal import load_principal
+from app.features.auth.role_checker import PermissionChecker, RoleChecker
+
+
+def test_permission_checker_follows_role_permission_changes(db, test_user):
+    role = Role(name=RoleName.EDITOR, description="Editor")
+    permission = Permission(name=PermissionName.CREATE_EXAM, description="Create exams")
+    db.add_all([role, permission])
+    db.flush()
+    link = RolePermission(role_id=role.id, permission_id=permission.id)
+    db.add_all([link, UserRole(user_id=test_user.id, role_id=role.id, assigned_by=test_user.id)])
+    db.commit()
+
+    principal = load_principal(db, test_user.id)
+    assert RoleChecker([RoleName.EDITOR])(principal)
+    assert PermissionChecker(PermissionName.CREATE_EXAM)(principal, db)
+
+    with pytest.raises(HTTPException):
+        RoleChecker([RoleName.ADMIN])(principal)
+
+    # the committed delete bumps the version, so the next check reloads
+    db.delete(link)
+    db.commit()
+    with pytest.raises(HTTPException):
+        PermissionChecker(PermissionName.CREATE_EXAM)(principal, db)
@@ -0,0 +1,140 @@
+# tests/test_refresh_tokens.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.features.auth.models import RefreshToken
+from app.features.auth.refresh_tokens import DatabaseRefreshTokenStore, IssuedRefreshToken, WriteBehindRefreshTokenStore, purge_expired_refresh_tokens
+from app.features.auth.revocation import RevocationList
+from tests.conftest import TestingSessionLocal
+
+
+class DictRedis:
+    """The commands the store uses, on a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def set(self, key, value, ex=None, get=False):
+        old = self.data.get(key)
+        self.data[key] = value
+        return old if get else True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def issued(jti, user_id):
+    return IssuedRefreshToken(jti, user_id, f"hash-{jti}", datetime.now(timezone.utc) + timedelta(days=1))
+
+
+def test_write_behind_store_writes_rows_on_flush(db, test_user):
+    store = WriteBehindRefreshTokenStore(DictRedis(), TestingSessionLocal, batch_size=10, interval=3600)
+    assert store.save(issued("a", test_user.id)) is None
+    store.flush()
+
+    # a login replaces the user's previous token, as with the database store
+    assert store.save(issued("b", test_user.id)) == "a"
+    assert store.save(issued("c", test_user.id)) == "b"
+    assert not store.is_active("a")
+    assert store.is_active("c")
+
+    store.revoke("c", db)
+    assert not store.is_active("c")
+
+    store.close()
+    db.expire_all()
+    rows = {row.jti: row.is_revoked for row in db.query(RefreshToken)}
+    assert rows == {"a": True, "b": True, "c": True}
+
+
+def test_write_behind_store_revokes_a_jti_being_flushed(db, test_user):
+    store = WriteBehindRefreshTokenStore(DictRedis(), TestingSessionLocal, batch_size=10, interval=3600)
+    store.save(issued("a", test_user.id))
+
+    # flush has taken the batch but not committed it when the token is revoked
+    batch = [store._pending.popleft()]
+    store.revoke("a", db)
+    store._insert(batch, set())
+
+    store.close()
+    db.expire_all()
+    assert db.query(RefreshToken).filter_by(jti="a").one().is_revoked
+
+
+def test_write_behind_store_drops_rows_the_database_rejects(db, test_user):
+    db.add(RefreshToken(jti="taken", user_id=test_user.id, token_hash="x",
+                        expires_at=datetime.now(timezone.utc) + timedelta(days=1)))
+    db.commit()
+
+    store = WriteBehindRefreshTokenStore(DictRedis(), TestingSessionLocal, batch_size=10, interval=3600)
+    for jti, user_id in (("x", "user-1"), ("taken", "user-2"), ("y", "user-3")):
+        store.save(issued(jti, user_id))
+
+    assert store.flush() == 2
+    assert store.flush() == 0
+    assert {row.jti for row in db.query(RefreshToken)} == {"taken", "x", "y"}
+
+
+def test_purge_expired_refresh_tokens(db, test_user):
+    now = datetime.now(timezone.utc)
+    for jti, expires_at in (("old-1", now - timedelta(days=1)), ("old-2", now - timedelta(seconds=1)), ("live", now + timedelta(days=1))):
+        db.add(RefreshToken(jti=jti, user_id=test_user.id, token_hash="x", expires_at=expires_at))
+    db.commit()
+
+    assert purge_expired_refresh_tokens(TestingSessionLocal, batch_size=1) == 2
+    assert [row.jti for row in db.query(RefreshToken)] == ["live"]
+
+
+def test_revocation_list_only_reports_revoked_jtis(db, test_user):
+    revoked = RevocationList(capacity=1000, error_rate=0.001, generation_ttl=3600)
+    db.add(RefreshToken(jti="from-table", user_id=test_user.id, token_hash="x",
+                        expires_at=datetime.now(timezone.utc) + timedelta(days=1), is_revoked=True))
+    db.commit()
+
+    assert revoked.load(db) == 1
+    revoked.revoke("logged-out")
+
+    assert revoked.might_be_revoked("from-table")
+    assert revoked.might_be_revoked("logged-out")
+    assert sum(revoked.might_be_revoked(f"jti-{i}") for i in range(1000)) < 10
+
+
+def test_revocation_list_forgets_jtis_after_two_generations():
+    revoked = RevocationList(capacity=1000, error_rate=0.001, generation_ttl=60)
+    revoked.revoke("old")
+
+    revoked._rotated_at -= 61
+    revoked.revoke("new")
+    # a jti stays for at least one token lifetime
+    assert revoked.might_be_revoked("old")
+    assert revoked.might_be_revoked("new")
+
+    revoked._rotated_at -= 61
+    assert not revoked.might_be_revoked("old")
+    assert revoked.might_be_revoked("new")
+
+
+def test_superseded_refresh_token_is_rejected(db, test_user, monkeypatch):
+    monkeypatch.setattr(security, "refresh_tokens", DatabaseRefreshTokenStore(TestingSessionLocal))
+    monkeypatch.setattr(security, "revocations", RevocationList(capacity=1000, error_rate=0.001, generation_ttl=3600))
+    first = asyncio.run(security.create_refresh_token(str(test_user.id), db))
+    second = asyncio.run(security.create_refresh_token(str(test_user.id), db))
+
+    # a restarted worker learns the superseded jti from the table
+    restarted = RevocationList(capacity=1000, error_rate=0.001, generation_ttl=3600)
+    assert restarted.load(db) == 1
+    for revocations in (security.revocations, restarted):
+        monkeypatch.setattr(security, "revocations", revocations)
+        assert asyncio.run(security.verify_token(second["token"], "refresh"))["jti"] == second["jti"]
+        with pytest.raises(HTTPException):
+            asyncio.run(security.verify_token(first["token"], "refresh"))
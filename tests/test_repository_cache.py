@@ -0,0 +1,34 @@
+# tests/test_repository_cache.py
+import uuid
+
+from app.features.address.models import Address
+from app.features.school.models import University
+from app.features.school.repository import UniversityRepository
+
+
+def test_cached_reads_follow_commits(db):
+    repo = UniversityRepository(db)
+    university_id = str(uuid.uuid4())
+
+    # the miss is cached, and dropped when the row is inserted
+    assert repo.get_cached(university_id) is None
+    address = Address(street="King George VI St", city="Addis Ababa", state="Addis Ababa", zip_code="1176", country="Ethiopia")
+    db.add(address)
+    db.flush()
+    db.add(University(id=university_id, name="Addis Ababa University", code="AAU", address_id=address.id))
+    db.commit()
+
+    university = repo.get_cached(university_id)
+    assert university.code == "AAU"
+    assert university.address.city == "Addis Ababa"
+
+    reads = []
+    repo.get = lambda id: reads.append(id)
+    assert repo.get_cached(university_id).code == "AAU"
+    assert reads == []
+    del repo.get
+
+    # an address change drops every entry embedding it
+    address.city = "Finfinne"
+    db.commit()
+    assert repo.get_cached(university_id).address.city == "Finfinne"
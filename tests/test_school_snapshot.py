@@ -0,0 +1,43 @@
+# tests/test_school_snapshot.py
+from fastapi import status
+
+from app.core.security import create_access_token
+from app.features.address.models import Address
+from app.features.school.models import University
+from app.features.school.snapshot import hierarchy
+
+
+def add_university(db, name: str, code: str) -> None:
+    address = Address(street="Arat Kilo", city="Addis Ababa", state="Addis Ababa", zip_code="1176", country="Ethiopia")
+    db.add(address)
+    db.flush()
+    db.add(University(name=name, code=code, address_id=address.id))
+    db.commit()
+
+
+def test_hierarchy_lists_revalidate_with_etag(client, db, test_user):
+    token = create_access_token(data={"sub": str(test_user.id)})["token"]
+    client.headers.update({"Authorization": f"Bearer {token}"})
+    hierarchy.invalidate()  # the lifespan loaded the application database
+    add_university(db, "Addis Ababa University", "AAU")
+
+    response = client.get("/api/v1/school/universities")
+    assert response.status_code == status.HTTP_200_OK
+    assert [u["code"] for u in response.json()] == ["AAU"]
+    assert response.json()[0]["address"]["city"] == "Addis Ababa"
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/v1/school/universities", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # a committed write refreshes the snapshot, and only the lists it touches change
+    programs_etag = client.get("/api/v1/school/programs").headers["ETag"]
+    add_university(db, "Bahir Dar University", "BDU")
+
+    response = client.get("/api/v1/school/universities", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(u["code"] for u in response.json()) == ["AAU", "BDU"]
+    assert response.headers["ETag"] != etag
+
+    response = client.get("/api/v1/school/programs", headers={"If-None-Match": programs_etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED